@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core_apps.common"
+
+    def ready(self):
+        from core_apps.common import signals
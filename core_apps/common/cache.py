@@ -0,0 +1,98 @@
+"""
+Versioned per-user response cache.
+
+Every user has a data version in the cache. Cached GET responses are keyed
+by (user, path, query params, version), so replacing the version
+invalidates all of a user's cached responses in one write without finding
+or deleting any keys; the stale entries simply age out. post_save/post_delete
+receivers in signals.py bump the owner's version when their goals, logs,
+submissions or wallet change, and bulk writers call bump_data_versions()
+themselves since .update() and bulk_create() send no signals.
+
+This only holds when every worker sees the same cache, so the response
+cache stays off on per-process backends (see response_cache_enabled).
+"""
+import hashlib
+import uuid
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core_apps.common.utils import shared_cache_configured
+
+HITS_KEY = "response_cache_hits"
+MISSES_KEY = "response_cache_misses"
+
+
+def _version_key(user_id):
+    return f"user_data_version_{user_id}"
+
+
+def response_cache_enabled():
+    """
+    False when the cache lives in each worker's own memory: a version bumped
+    in one worker would go unseen by the rest, which would keep serving
+    stale responses until they expire.
+    """
+    return settings.RESPONSE_CACHE_TTL > 0 and shared_cache_configured()
+
+
+def _new_version():
+    # Random rather than counted, so a bump is a single set (atomic on every
+    # backend, unlike incr) and an evicted version can never come back as
+    # one that older responses were stored under
+    return uuid.uuid4().hex
+
+
+def data_version(user_id):
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = _new_version()
+        if not cache.add(_version_key(user_id), version, timeout=None):
+            version = cache.get(_version_key(user_id), version)
+    return version
+
+
+def record_hit(hit):
+    _incr(HITS_KEY if hit else MISSES_KEY)
+
+
+def _incr(key):
+    # Only feeds the stats, so a lost update on backends without an atomic
+    # incr is acceptable
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _bump(user_id):
+    cache.set(_version_key(user_id), _new_version(), timeout=None)
+
+
+def bump_data_versions(user_ids):
+    """Invalidate every cached response for `user_ids` once the current transaction commits."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if user_ids:
+        transaction.on_commit(lambda: [_bump(user_id) for user_id in user_ids])
+
+
+def response_cache_key(request):
+    user_id = request.user.pk
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.md5(f"{request.path}?{params}".encode()).hexdigest()
+    return f"response_{user_id}_{data_version(user_id)}_{digest}"
+
+
+def cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "enabled": response_cache_enabled(),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else None,
+    }
+
@@ -0,0 +1,73 @@
+"""
+Aggregate payload for the home screen.
+
+Everything the app shows on launch is built in one pass with a fixed number
+of queries (goals and their relations, today's logs, pending submissions and
+the wallet), and the result is cached per user for DASHBOARD_CACHE_TTL
+seconds. Writes to any of the underlying rows drop the cached copy. That
+drop has to reach every worker, so the dashboard is only cached on a shared
+backend (see dashboard_cache_enabled).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from core_apps.common.utils import shared_cache_configured
+from core_apps.goals.models import Goal
+from core_apps.goals.serializers import GoalSerializer
+from core_apps.logs.models import GoalLog
+from core_apps.logs.serializers import GoalLogListSerializer
+from core_apps.submissions.models import Submission
+from core_apps.submissions.serializers import SubmissionListSerializer
+from core_apps.users.serializers import UserProfileSerializer
+from core_apps.users.utils import user_local_date
+from core_apps.wallets.models import Wallet
+from core_apps.wallets.serializers import WalletSerializer
+
+PENDING_SUBMISSION_STATUSES = ["submitted", "under_review"]
+
+
+def dashboard_cache_enabled():
+    return settings.DASHBOARD_CACHE_TTL > 0 and shared_cache_configured()
+
+
+def dashboard_cache_key(user_id):
+    return f"dashboard_{user_id}"
+
+
+def invalidate_dashboard(user_id):
+    """Drop the cached dashboard once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(dashboard_cache_key(user_id)))
+
+
+def build_dashboard(user):
+    today = user_local_date(user)
+    goals = (
+        Goal.objects.filter(user=user, is_active=True)
+        .select_related("progress")
+        .prefetch_related("human_verifiers", "specific_date_entries")
+    )
+    logs = GoalLog.objects.filter(user=user, date=today).select_related("goal")
+    submissions = Submission.objects.filter(
+        user=user, status__in=PENDING_SUBMISSION_STATUSES
+    ).select_related("goal_log", "goal_log__goal")
+    wallet = Wallet.objects.filter(user=user).first()
+    return {
+        "profile": UserProfileSerializer(user).data,
+        "today": today,
+        "goals": GoalSerializer(goals, many=True).data,
+        "today_logs": GoalLogListSerializer(logs, many=True).data,
+        "pending_submissions": SubmissionListSerializer(submissions, many=True).data,
+        "wallet": WalletSerializer(wallet).data if wallet else None,
+    }
+
+
+def get_dashboard(user):
+    """Cached dashboard for `user`, built on a miss."""
+    if not dashboard_cache_enabled():
+        return build_dashboard(user)
+    key = dashboard_cache_key(user.pk)
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard(user)
+        cache.set(key, data, timeout=settings.DASHBOARD_CACHE_TTL)
+    return data
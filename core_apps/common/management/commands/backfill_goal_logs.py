@@ -0,0 +1,37 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from core_apps.goals.models import Goal
+from core_apps.logs.service import backfill_goal_logs
+
+
+class Command(BaseCommand):
+    help = "Write missed GoalLog rows for scheduled days before today that have no log. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--goal-id", type=str, help="Only backfill this goal (UUID).")
+        parser.add_argument(
+            "--until",
+            type=str,
+            help="Backfill days before this date (YYYY-MM-DD). Defaults to each owner's local today.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        until = None
+        if options["until"]:
+            try:
+                until = datetime.date.fromisoformat(options["until"])
+            except ValueError:
+                raise CommandError("--until must be a date in YYYY-MM-DD format.")
+
+        goals = Goal.objects.filter(is_active=True).select_related("user").prefetch_related(
+            "specific_date_entries"
+        ).order_by("pkid")
+        if options["goal_id"]:
+            goals = goals.filter(id=options["goal_id"])
+
+        written = 0
+        for goal in goals.iterator(chunk_size=options["chunk_size"]):
+            written += backfill_goal_logs(goal, until=until, chunk_size=options["chunk_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {written} goal log(s)."))
@@ -0,0 +1,67 @@
+import datetime
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from core_apps.goals.models import Goal, GoalSpecificDate
+from core_apps.goals.recurrence import date_ordinals, schedule_weekday_mask
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill derived schedule columns (weekday_mask) on existing goals and move "
+        "legacy specific_dates JSON into GoalSpecificDate rows. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        updated = self.backfill_weekday_masks(chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Backfilled weekday_mask on {updated} goal(s)."))
+        moved, rows = self.backfill_specific_dates(chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Moved {rows} specific date(s) off {moved} goal(s)."))
+
+    def backfill_weekday_masks(self, chunk_size):
+        goals = Goal.objects.only(
+            "pkid", "frequency", "weekdays", "target_count", "start_date", "weekday_mask"
+        ).order_by("pkid")
+
+        changed = []
+        updated = 0
+        for goal in goals.iterator(chunk_size=chunk_size):
+            mask = schedule_weekday_mask(goal)
+            if goal.weekday_mask != mask:
+                goal.weekday_mask = mask
+                changed.append(goal)
+            if len(changed) >= chunk_size:
+                Goal.objects.bulk_update(changed, ["weekday_mask"])
+                updated += len(changed)
+                changed = []
+        if changed:
+            Goal.objects.bulk_update(changed, ["weekday_mask"])
+            updated += len(changed)
+        return updated
+
+    def backfill_specific_dates(self, chunk_size):
+        moved = 0
+        rows = 0
+        while True:
+            goals = list(
+                Goal.objects.filter(specific_dates__isnull=False)
+                .only("pkid", "specific_dates")
+                .order_by("pkid")[:chunk_size]
+            )
+            if not goals:
+                break
+            entries = [
+                GoalSpecificDate(goal_id=goal.pkid, date=datetime.date.fromordinal(ordinal))
+                for goal in goals
+                for ordinal in date_ordinals(goal.specific_dates)
+            ]
+            with transaction.atomic():
+                GoalSpecificDate.objects.bulk_create(entries, ignore_conflicts=True)
+                # The compiled schedule is unchanged, so updated_at is left alone
+                Goal.objects.filter(pkid__in=[goal.pkid for goal in goals]).update(specific_dates=None)
+            moved += len(goals)
+            rows += len(entries)
+        return moved, rows
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Subquery
+from core_apps.goals.models import Goal
+from core_apps.logs.models import GoalLog
+from core_apps.submissions.models import Submission
+
+
+class Command(BaseCommand):
+    help = "Backfill the denormalized user column on GoalLog and Submission rows. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        logs = self.backfill(
+            GoalLog,
+            Subquery(Goal.objects.filter(pkid=OuterRef("goal_id")).values("user_id")[:1]),
+            chunk_size,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Backfilled user on {logs} goal log(s)."))
+
+        # Runs after the logs so their user column can be copied directly
+        submissions = self.backfill(
+            Submission,
+            Subquery(GoalLog.objects.filter(pkid=OuterRef("goal_log_id")).values("user_id")[:1]),
+            chunk_size,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Backfilled user on {submissions} submission(s)."))
+
+    def backfill(self, model, owner, chunk_size):
+        """UPDATE rows with no user from `owner`, walking pkids in chunks."""
+        updated = 0
+        last_pkid = 0
+        while True:
+            pkids = list(
+                model.objects.filter(user__isnull=True, pkid__gt=last_pkid)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:chunk_size]
+            )
+            if not pkids:
+                break
+            updated += model.objects.filter(pkid__in=pkids).update(user_id=owner)
+            last_pkid = pkids[-1]
+        return updated
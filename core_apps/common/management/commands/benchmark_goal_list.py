@@ -0,0 +1,100 @@
+import datetime
+import time
+import uuid
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+from core_apps.goals.models import Goal, GoalProgress, GoalSpecificDate
+from core_apps.goals.serializers import GoalRowSerializer, GoalSerializer
+from core_apps.verifications.models import HumanVerifier
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Time goal list serialization: GoalSerializer without prefetching, with prefetching, "
+        "and GoalRowSerializer. Sample data is created in a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--goals", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per variant; the best is reported.")
+
+    def handle(self, *args, **options):
+        if options["goals"] <= 0 or options["repeat"] <= 0:
+            raise CommandError("--goals and --repeat must be positive.")
+
+        with transaction.atomic():
+            user = self.create_sample(options["goals"])
+            base = Goal.objects.filter(user=user)
+            variants = [
+                ("GoalSerializer", lambda: GoalSerializer(base, many=True).data),
+                ("GoalSerializer + prefetch", lambda: GoalSerializer(
+                    base.select_related("progress").prefetch_related("human_verifiers", "specific_date_entries"),
+                    many=True,
+                ).data),
+                ("GoalRowSerializer", lambda: GoalRowSerializer(base).data),
+            ]
+
+            outputs = []
+            for label, run in variants:
+                best, queries, data = self.measure(run, options["repeat"])
+                outputs.append([dict(goal) for goal in data])
+                self.stdout.write(f"{label:<28} {best * 1000:9.1f} ms  {queries:5d} queries")
+
+            if any(output != outputs[0] for output in outputs[1:]):
+                self.stdout.write(self.style.ERROR("Serializer outputs differ."))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"Outputs match for {options['goals']} goal(s)."))
+            transaction.set_rollback(True)
+
+    def measure(self, run, repeat):
+        """(best time, queries per run, output) over `repeat` runs of `run`."""
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        best = None
+        with connection.execute_wrapper(count):
+            for _ in range(repeat):
+                started = time.perf_counter()
+                data = run()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+        return best, len(queries) // repeat, data
+
+    def create_sample(self, count):
+        tag = uuid.uuid4().hex[:8]
+        user = User.objects.create(username=f"bench_{tag}", email=f"bench_{tag}@example.com")
+        today = timezone.now().date()
+        goals = Goal.objects.bulk_create([
+            Goal(
+                user=user,
+                title=f"Goal {i}",
+                description="Benchmark goal",
+                start_date=today,
+                frequency="specific_days" if i % 4 == 0 else "daily",
+                duration_minutes=30,
+                penalty_amount=10,
+            )
+            for i in range(count)
+        ])
+        HumanVerifier.objects.bulk_create([
+            HumanVerifier(goal=goal, contact_type="email", contact_value=f"v{n}@example.com", name=f"Verifier {n}")
+            for goal in goals
+            for n in range(2)
+        ])
+        # Every tenth goal has no progress row yet, as for goals nobody has logged against
+        GoalProgress.objects.bulk_create([
+            GoalProgress(goal=goal, current_streak=3) for i, goal in enumerate(goals) if i % 10
+        ])
+        GoalSpecificDate.objects.bulk_create([
+            GoalSpecificDate(goal=goal, date=today + datetime.timedelta(days=n))
+            for goal in goals[::4]
+            for n in range(3)
+        ])
+        return user
@@ -0,0 +1,27 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from core_apps.logs.archive import archive_cutoff, compact_goal_logs
+
+
+class Command(BaseCommand):
+    help = (
+        "Fold settled goal logs older than GOAL_LOG_ARCHIVE_AFTER_DAYS into per goal-year "
+        "archive rows and delete them from the hot table. Safe to re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", type=str, help="Compact logs dated before this day (YYYY-MM-DD).")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff()
+        if options["before"]:
+            try:
+                cutoff = datetime.date.fromisoformat(options["before"])
+            except ValueError:
+                raise CommandError("--before must be a date in YYYY-MM-DD format.")
+
+        goal_years, deleted = compact_goal_logs(cutoff, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted {deleted} goal log(s) before {cutoff} into {goal_years} goal-year archive(s)."
+        ))
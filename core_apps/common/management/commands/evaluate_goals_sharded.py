@@ -0,0 +1,42 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core_apps.goals.models import EvaluationShard
+from core_apps.goals.tasks import run_sharded_evaluation
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate due goals in parallel pkid shards. Finished shards are checkpointed, "
+        "so re-running after a failure resumes instead of starting over."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Day to evaluate (YYYY-MM-DD). Defaults to today.")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--shard-size", type=int, default=50000, help="Goal pkids per shard.")
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Goals per query batch inside a shard.")
+        parser.add_argument("--restart", action="store_true", help="Discard checkpoints for the day and start over.")
+
+    def handle(self, *args, **options):
+        if options["date"]:
+            try:
+                day = datetime.date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("--date must be in YYYY-MM-DD format.")
+        else:
+            day = timezone.now().date()
+
+        if options["restart"]:
+            EvaluationShard.objects.filter(run_date=day).delete()
+
+        shards, failed, missed = run_sharded_evaluation(
+            day,
+            workers=options["workers"],
+            shard_size=options["shard_size"],
+            chunk_size=options["chunk_size"],
+        )
+        message = f"Evaluated {shards} shard(s) for {day}: {missed} missed log(s) written."
+        if failed:
+            raise CommandError(f"{message} {failed} shard(s) failed; re-run to resume.")
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from core_apps.goals.tasks import evaluate_timezone_wave
+
+
+class Command(BaseCommand):
+    help = (
+        "Evaluate goals for users whose local day has ended since their timezone "
+        "was last evaluated. Schedule hourly, a few minutes past the hour."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        results = evaluate_timezone_wave(chunk_size=options["chunk_size"])
+        if not results:
+            self.stdout.write("No timezone has an ended day left to evaluate.")
+            return
+        for day, missed in results.items():
+            self.stdout.write(self.style.SUCCESS(f"{day}: {missed} missed log(s) written."))
@@ -0,0 +1,56 @@
+import datetime
+import sys
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from core_apps.logs.export import ENCODERS, export_queryset, iter_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream goal log history (with submission and penalty data) as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=str, help="Only export this user's logs (email).")
+        parser.add_argument("--goal-id", type=str, help="Only export this goal (UUID).")
+        parser.add_argument("--start-date", type=str, help="YYYY-MM-DD")
+        parser.add_argument("--end-date", type=str, help="YYYY-MM-DD")
+        parser.add_argument("--status", type=str)
+        parser.add_argument("--format", dest="export_format", choices=list(ENCODERS), default="ndjson")
+        parser.add_argument("--output", type=str, help="File to write to. Defaults to stdout.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = User.objects.get(email=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {options['user']}")
+
+        dates = {}
+        for key in ("start_date", "end_date"):
+            if options[key]:
+                try:
+                    dates[key] = datetime.date.fromisoformat(options[key])
+                except ValueError:
+                    raise CommandError(f"--{key.replace('_', '-')} must be a date in YYYY-MM-DD format.")
+
+        queryset = export_queryset(
+            user=user, goal_id=options["goal_id"], status=options["status"], **dates
+        )
+        encoder, _ = ENCODERS[options["export_format"]]
+        lines = encoder(iter_rows(queryset, chunk_size=options["chunk_size"]))
+
+        output = open(options["output"], "w", newline="") if options["output"] else sys.stdout
+        written = 0
+        try:
+            for line in lines:
+                output.write(line)
+                written += 1
+        finally:
+            if options["output"]:
+                output.close()
+
+        if options["output"]:
+            self.stdout.write(self.style.SUCCESS(f"Wrote {written} line(s) to {options['output']}."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from core_apps.goals.occurrences import materialize_occurrences
+
+
+class Command(BaseCommand):
+    help = "Fill GoalOccurrence rows for active goals up to N days ahead. Run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.GOAL_OCCURRENCE_HORIZON_DAYS,
+            help="Number of days ahead to materialize.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = materialize_occurrences(
+            horizon_days=options["days"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Materialized {written} goal occurrences."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.conf import settings
+from core_apps.logs.service import precreate_pending_logs
+
+
+class Command(BaseCommand):
+    help = "Create pending GoalLog rows for active goals up to N days ahead. Idempotent; run daily."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.GOAL_LOG_PRECREATE_DAYS,
+            help="Number of days ahead to create pending logs for.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created, elapsed = precreate_pending_logs(
+            days=options["days"],
+            chunk_size=options["chunk_size"],
+        )
+        rate = created / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} pending goal logs in {elapsed:.2f}s ({rate:.0f} rows/s)."
+        ))
@@ -0,0 +1,14 @@
+import datetime
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core_apps.common.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. Run daily."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstone(s)."))
@@ -0,0 +1,32 @@
+import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from core_apps.logs.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute UserDailyRollup rows from GoalLog for a date range. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-date", type=str, help="YYYY-MM-DD. Defaults to 30 days ago.")
+        parser.add_argument("--end-date", type=str, help="YYYY-MM-DD. Defaults to today.")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        try:
+            end_date = datetime.date.fromisoformat(options["end_date"]) if options["end_date"] else today
+            start_date = (
+                datetime.date.fromisoformat(options["start_date"])
+                if options["start_date"]
+                else end_date - datetime.timedelta(days=30)
+            )
+        except ValueError:
+            raise CommandError("Dates must be in YYYY-MM-DD format.")
+        if start_date > end_date:
+            raise CommandError("--start-date must not be after --end-date.")
+
+        written = rebuild_rollups(start_date, end_date, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} daily rollup(s) for {start_date} to {end_date}."
+        ))
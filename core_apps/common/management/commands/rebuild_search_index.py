@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from core_apps.common.search import ensure_search_index, index_goals, index_text_submissions
+from core_apps.goals.models import Goal
+from core_apps.submissions.models import TextSubmission
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for every goal and text submission. Safe to re-run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        ensure_search_index()
+        goals = self.rebuild(Goal, index_goals, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {goals} goal(s)."))
+        submissions = self.rebuild(TextSubmission, index_text_submissions, options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {submissions} text submission(s)."))
+
+    def rebuild(self, model, index, chunk_size):
+        """Pass every primary key of `model` to `index`, walking them in chunks."""
+        indexed = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                model.objects.filter(pk__gt=last_pk).order_by("pk").values_list("pk", flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+            index(pks)
+            indexed += len(pks)
+            last_pk = pks[-1]
+        return indexed
@@ -1,5 +1,9 @@
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework import status
+from .cache import record_hit, response_cache_enabled, response_cache_key
+from .serializers import renders
 
 class StandardResponseMixin:
     """
@@ -15,6 +19,14 @@ class StandardResponseMixin:
             "message": message
         }, status=status_code)
     
+    def paginated_response(self, data, message="", status_code=status.HTTP_200_OK):
+        """Standardized success response for a page from self.paginator"""
+        return self.success_response(
+            data=self.paginator.get_paginated_data(data),
+            message=message,
+            status_code=status_code,
+        )
+    
     def error_response(self, error_message, status_code=status.HTTP_400_BAD_REQUEST):
         """
         Return standardized error response.
@@ -56,3 +68,46 @@ class StandardResponseMixin:
             error_message = self.format_serializer_errors(serializer.errors)
             return None, self.error_response(error_message)
         return serializer, None
+
+
+class SparseFieldsetViewMixin:
+    """
+    Loads only the relations the response will render.
+
+    `queryset_relations` maps a dotted serializer field to the queryset
+    method and lookup that loads it, e.g.
+        {"human_verifiers": ("prefetch_related", "human_verifiers")}
+    Call with_requested_relations() from get_queryset().
+    """
+    queryset_relations = {}
+
+    def with_requested_relations(self, queryset):
+        serializer = self.get_serializer()
+        for path, (method, lookup) in self.queryset_relations.items():
+            if renders(serializer, path):
+                queryset = getattr(queryset, method)(lookup)
+        return queryset
+
+
+class CachedResponseMixin:
+    """
+    Serve successful GET responses from the per-user versioned cache for
+    RESPONSE_CACHE_TTL seconds. List it before the generic view class.
+    Does nothing unless the cache is shared by every worker.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not response_cache_enabled():
+            return super().get(request, *args, **kwargs)
+        key = response_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            record_hit(True)
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        record_hit(False)
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and hasattr(response, "data"):
+            cache.set(key, response.data, timeout=settings.RESPONSE_CACHE_TTL)
+        response["X-Cache"] = "MISS"
+        return response
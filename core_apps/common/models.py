@@ -1,4 +1,5 @@
 import uuid
+from django.conf import settings
 from django.db import models
 
 
@@ -10,4 +11,32 @@ class TimeStampedUUIDModel(models.Model):
 
     class Meta:
         abstract = True
-        ordering = ["-created_at", "updated_at"]
\ No newline at end of file
+        ordering = ["-created_at", "updated_at"]
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, kept so delta sync can tell clients what to drop.
+    Pruned after SYNC_TOMBSTONE_RETENTION_DAYS by the prune_tombstones command.
+    """
+    kind = models.CharField(max_length=32)  # e.g. "goals", "logs"
+    object_id = models.UUIDField()
+    # No FK constraint: the owner may be deleted in the same transaction
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "deleted_at"])]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
+
+    @classmethod
+    def record(cls, kind, user_id, object_ids):
+        """Tombstone every id in `object_ids` with one INSERT."""
+        cls.objects.bulk_create([cls(kind=kind, object_id=object_id, user_id=user_id) for object_id in object_ids])
@@ -0,0 +1,135 @@
+import base64
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Forward-only keyset pagination over a unique composite ordering.
+
+    The cursor is an opaque token holding the ordering values of the last row
+    on the page, and the next page is fetched with a WHERE on those values
+    instead of an OFFSET, so page 1,000 costs the same as page one. There is
+    no total count. Subclasses set `ordering` to the fields of a matching
+    composite index, ending with a unique field such as pkid.
+    """
+    ordering = ("-pkid",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        # One extra row tells us whether there is a next page
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def _fields(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def _after(self, position):
+        """Rows strictly after `position` in ordering order, as an OR of equality prefixes."""
+        condition = Q()
+        prefix = {}
+        for (name, descending), value in zip(self._fields(), position):
+            lookup = "lt" if descending else "gt"
+            condition |= Q(**prefix, **{f"{name}__{lookup}": value})
+            prefix[name] = value
+        return condition
+
+    def encode_cursor(self, row):
+        values = [getattr(row, name) for name, _ in self._fields()]
+        raw = json.dumps([v.isoformat() if hasattr(v, "isoformat") else v for v in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(fields, values)
+            ]
+        except (TypeError, ValueError, ValidationError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class GoalLogCursorPagination(KeysetPagination):
+    ordering = ("-date", "-pkid")
+
+
+class SubmissionCursorPagination(KeysetPagination):
+    ordering = ("-submitted_at", "-pkid")
+
+
+class NumberedPagination(PageNumberPagination):
+    """PageNumberPagination that works with StandardResponseMixin.paginated_response."""
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def get_paginated_data(self, data):
+        return {
+            "count": self.page.paginator.count,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
@@ -0,0 +1,205 @@
+"""
+Full-text search over goals and text submissions.
+
+On PostgreSQL, Goal and TextSubmission each carry a weighted tsvector column
+with a GIN index. Rows are matched with a websearch query and ranked with
+ts_rank. Other databases (SQLite for local and test runs) keep the same text
+in an FTS5 virtual table ranked with bm25. ensure_search_index() creates the
+GIN indexes or the FTS5 table after every migrate. Both are refreshed by
+post_save/post_delete receivers in signals.py, and rebuild_search_index
+fills them for existing rows.
+
+search() returns an object that supports count() and slicing, so it can be
+handed straight to a paginator. Each result is
+{"kind", "id", "title", "snippet", "rank"}, where a higher rank is a better match.
+"""
+import re
+from django.conf import settings
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Value
+from core_apps.common.utils import uses_postgres
+from core_apps.goals.models import Goal
+from core_apps.submissions.models import TextSubmission
+
+KINDS = ("goal", "submission")
+FTS_TABLE = "common_search_fts"
+HIGHLIGHT = ("<b>", "</b>")
+GIN_INDEXES = (("goal_search_gin", Goal), ("text_submission_search_gin", TextSubmission))
+
+
+def goal_vector():
+    return (
+        SearchVector("title", weight="A", config=settings.SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=settings.SEARCH_CONFIG)
+    )
+
+
+def submission_vector():
+    return SearchVector("content", weight="A", config=settings.SEARCH_CONFIG)
+
+
+# Writes
+
+def ensure_search_index():
+    """
+    Create this database's search index if it is missing. It lives outside
+    the models' Meta.indexes so model state, and the migrations generated
+    from it, are the same whichever database makemigrations runs against.
+    """
+    with connection.cursor() as cursor:
+        if uses_postgres():
+            for name, model in GIN_INDEXES:
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {connection.ops.quote_name(name)} "
+                    f"ON {connection.ops.quote_name(model._meta.db_table)} USING gin (search_vector)"
+                )
+            return
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "kind UNINDEXED, object_id UNINDEXED, user_id UNINDEXED, title, body, "
+            "tokenize='porter unicode61')"
+        )
+
+
+def _fts_delete(kind, object_ids):
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE kind = %s AND object_id = %s",
+            [(kind, str(object_id)) for object_id in object_ids],
+        )
+
+
+def _fts_insert(rows):
+    """rows: (kind, object_id, user_id, title, body)"""
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (kind, object_id, user_id, title, body) VALUES (%s, %s, %s, %s, %s)",
+            [(kind, str(object_id), user_id, title, body) for kind, object_id, user_id, title, body in rows],
+        )
+
+
+def index_goals(goal_pkids):
+    if uses_postgres():
+        Goal.objects.filter(pkid__in=goal_pkids).update(search_vector=goal_vector())
+        return
+    rows = list(Goal.objects.filter(pkid__in=goal_pkids).values_list("pkid", "user_id", "title", "description"))
+    _fts_delete("goal", goal_pkids)
+    _fts_insert([("goal", pkid, user_id, title, description) for pkid, user_id, title, description in rows])
+
+
+def index_text_submissions(pks):
+    if uses_postgres():
+        TextSubmission.objects.filter(pk__in=pks).update(search_vector=submission_vector())
+        return
+    rows = list(TextSubmission.objects.filter(pk__in=pks).values_list("pk", "submission__user_id", "content"))
+    _fts_delete("submission", pks)
+    _fts_insert([("submission", pk, user_id, "", content) for pk, user_id, content in rows])
+
+
+def unindex(kind, object_id):
+    """Drop a deleted row from the FTS table. Postgres vectors go with their row."""
+    if not uses_postgres():
+        _fts_delete(kind, [object_id])
+
+
+# Reads
+
+class PostgresResults:
+    def __init__(self, query, user=None, kinds=KINDS):
+        search_query = SearchQuery(query, search_type="websearch", config=settings.SEARCH_CONFIG)
+        parts = []
+        if "goal" in kinds:
+            goals = Goal.objects.filter(search_vector=search_query)
+            if user is not None:
+                goals = goals.filter(user=user)
+            parts.append(goals.order_by().values(
+                kind=Value("goal"),
+                object_id=F("id"),
+                label=F("title"),
+                snippet=SearchHeadline("description", search_query, config=settings.SEARCH_CONFIG,
+                                       start_sel=HIGHLIGHT[0], stop_sel=HIGHLIGHT[1]),
+                rank=SearchRank(F("search_vector"), search_query),
+            ))
+        if "submission" in kinds:
+            submissions = TextSubmission.objects.filter(search_vector=search_query)
+            if user is not None:
+                submissions = submissions.filter(submission__user=user)
+            parts.append(submissions.order_by().values(
+                kind=Value("submission"),
+                object_id=F("submission__id"),
+                label=F("submission__goal_log__goal__title"),
+                snippet=SearchHeadline("content", search_query, config=settings.SEARCH_CONFIG,
+                                       start_sel=HIGHLIGHT[0], stop_sel=HIGHLIGHT[1]),
+                rank=SearchRank(F("search_vector"), search_query),
+            ))
+        self.queryset = parts[0].union(*parts[1:], all=True).order_by("-rank", "object_id")
+
+    def count(self):
+        return self.queryset.count()
+
+    def __getitem__(self, index):
+        return [
+            {"kind": row["kind"], "id": row["object_id"], "title": row["label"],
+             "snippet": row["snippet"], "rank": row["rank"]}
+            for row in self.queryset[index]
+        ]
+
+
+class FTSResults:
+    def __init__(self, query, user=None, kinds=KINDS):
+        # Quote every word so user input can't use (or break) FTS5 query syntax
+        self.match = " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+        self.where = f"{FTS_TABLE} MATCH %s AND kind IN ({', '.join(['%s'] * len(kinds))})"
+        self.params = [self.match, *kinds]
+        if user is not None:
+            self.where += " AND user_id = %s"
+            self.params.append(user.pk)
+
+    def count(self):
+        if not self.match:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {self.where}", self.params)
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, index):
+        if not self.match:
+            return []
+        start = index.start or 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT kind, object_id, snippet({FTS_TABLE}, -1, %s, %s, '...', 12), "
+                f"-bm25({FTS_TABLE}, 0, 0, 0, 2.0, 1.0) AS rank "
+                f"FROM {FTS_TABLE} WHERE {self.where} ORDER BY rank DESC, object_id LIMIT %s OFFSET %s",
+                [*HIGHLIGHT, *self.params, index.stop - start, start],
+            )
+            rows = cursor.fetchall()
+        return self.describe(rows)
+
+    def describe(self, rows):
+        """Attach public ids and titles, which the FTS table doesn't store."""
+        goal_pkids = [int(object_id) for kind, object_id, _, _ in rows if kind == "goal"]
+        submission_pks = [int(object_id) for kind, object_id, _, _ in rows if kind == "submission"]
+        labels = {
+            ("goal", str(pkid)): (uuid, title)
+            for pkid, uuid, title in Goal.objects.filter(pkid__in=goal_pkids).values_list("pkid", "id", "title")
+        }
+        labels.update({
+            ("submission", str(pk)): (uuid, title)
+            for pk, uuid, title in TextSubmission.objects.filter(pk__in=submission_pks).values_list(
+                "pk", "submission__id", "submission__goal_log__goal__title"
+            )
+        })
+        return [
+            {"kind": kind, "id": labels[(kind, object_id)][0], "title": labels[(kind, object_id)][1],
+             "snippet": snippet, "rank": rank}
+            for kind, object_id, snippet, rank in rows
+            if (kind, object_id) in labels
+        ]
+
+
+def search(query, user=None, kinds=KINDS):
+    """Ranked matches for `query`, limited to `user`'s rows unless user is None."""
+    results_class = PostgresResults if uses_postgres() else FTSResults
+    return results_class(query, user=user, kinds=kinds)
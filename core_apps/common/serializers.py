@@ -0,0 +1,120 @@
+"""
+Sparse fieldsets for read endpoints.
+
+    ?fields=id,title,progress.current_streak
+        Output only the listed fields. Dotted names reach into nested
+        serializers; naming a nested field without a dot keeps it whole.
+    ?expand=human_verifiers,goal.progress
+        Nest only the listed relations out of each serializer's
+        Meta.expandable_fields; the rest are left out. Without ?expand every
+        expandable relation is nested, which is the historical shape.
+
+Both only apply to GET requests, so writes always validate the full
+serializer. Views declare which select_related/prefetch_related each
+relation needs (see SparseFieldsetViewMixin) and only pay for the ones the
+response will render.
+"""
+from django.conf import settings
+from rest_framework import serializers
+
+
+def parse_paths(value):
+    """'id,goal.title,goal.id' -> {'id': {}, 'goal': {'title': {}, 'id': {}}}"""
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in path.strip().split("."):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+class Shape:
+    """The requested fields and expansions at one level of a nested response."""
+
+    def __init__(self, fields=None, expand=None):
+        # None means "no restriction" for fields and "default" for expand
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None or request.method not in ("GET", "HEAD"):
+            return cls()
+        params = request.query_params
+        fields = params.get("fields")
+        expand = params.get("expand")
+        return cls(
+            fields=parse_paths(fields) if fields else None,
+            expand=parse_paths(expand) if expand is not None else None,
+        )
+
+    @property
+    def unrestricted(self):
+        """True when the client asked for the default shape."""
+        return self.fields is None and self.expand is None
+
+    def includes(self, name, expandable=False):
+        if self.fields is not None and name not in self.fields:
+            return False
+        if expandable and self.expand is not None and name not in self.expand:
+            return False
+        return True
+
+    def child(self, name):
+        fields = self.fields.get(name) if self.fields is not None else None
+        expand = self.expand.get(name, {}) if self.expand is not None else None
+        return Shape(fields=fields or None, expand=expand)
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that drops fields outside the requested Shape.
+    Relations listed in Meta.expandable_fields are only nested on request.
+    """
+
+    def __init__(self, *args, shape=None, **kwargs):
+        self._shape = shape
+        super().__init__(*args, **kwargs)
+
+    def get_shape(self):
+        if self._shape is None:
+            # Only the outermost serializer reads the query string; nested
+            # ones are handed their slice of it by their parent
+            outermost = self.parent is None or (
+                isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+            )
+            request = self.context.get("request") if outermost else None
+            self._shape = Shape.from_request(request)
+        return self._shape
+
+    def get_fields(self):
+        fields = super().get_fields()
+        shape = self.get_shape()
+        expandable = getattr(self.Meta, "expandable_fields", ())
+        for name in list(fields):
+            if not shape.includes(name, name in expandable):
+                del fields[name]
+                continue
+            nested = getattr(fields[name], "child", fields[name])
+            if isinstance(nested, SparseFieldsetMixin):
+                nested._shape = shape.child(name)
+        return fields
+
+
+def renders(serializer, path):
+    """True if `serializer` will output the dotted field `path`."""
+    for name in path.split("."):
+        fields = getattr(getattr(serializer, "child", serializer), "fields", None)
+        if fields is None or name not in fields:
+            return False
+        serializer = fields[name]
+    return True
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=serializers.CharField(max_length=2048),
+        allow_empty=False,
+        max_length=settings.BATCH_MAX_REQUESTS,
+    )
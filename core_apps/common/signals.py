@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.apps import apps
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete
+
+from core_apps.goals.models import Goal
+from core_apps.logs.models import GoalLog
+from core_apps.submissions.models import Submission, TextSubmission
+from core_apps.wallets.models import Wallet, WalletTransaction
+from .cache import bump_data_versions
+from .dashboard import invalidate_dashboard
+from .models import Tombstone
+from .search import ensure_search_index, index_goals, index_text_submissions, unindex
+
+
+def _wallet_owner(transaction):
+    return Wallet.objects.filter(pkid=transaction.wallet_id).values_list("user_id", flat=True).first()
+
+
+# Synced model -> (tombstone kind, owner lookup). GoalLog is left out on
+# purpose: any post_delete receiver on it makes Django load and signal every
+# row of a bulk delete, and archive compaction deletes thousands of logs that
+# clients don't need to drop. Code that deletes logs a client may hold
+# tombstones them in bulk with Tombstone.record() instead.
+SYNCED_MODELS = {
+    Goal: ("goals", lambda goal: goal.user_id),
+    Submission: ("submissions", lambda submission: submission.user_id),
+    WalletTransaction: ("wallet_transactions", _wallet_owner),
+}
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """Remember a deleted synced row so the owner's next delta sync drops it."""
+    kind, owner = SYNCED_MODELS[sender]
+    user_id = owner(instance)
+    if user_id is None:
+        return
+    Tombstone.objects.create(kind=kind, object_id=instance.id, user_id=user_id)
+
+
+def record_log_tombstones(sender, instance, **kwargs):
+    """A deleted goal's logs go with it by cascade, without signals of their own."""
+    Tombstone.record("logs", instance.user_id, instance.logs.values_list("id", flat=True))
+
+
+for model in SYNCED_MODELS:
+    post_delete.connect(record_tombstone, sender=model, dispatch_uid=f"tombstone_{model.__name__}")
+pre_delete.connect(record_log_tombstones, sender=Goal, dispatch_uid="tombstone_goal_logs")
+
+
+# Model -> owner lookup for rows rendered on the dashboard
+DASHBOARD_MODELS = {
+    get_user_model(): lambda user: user.pk,
+    Goal: lambda goal: goal.user_id,
+    GoalLog: lambda log: log.user_id,
+    Submission: lambda submission: submission.user_id,
+    Wallet: lambda wallet: wallet.user_id,
+}
+
+
+def drop_cached_dashboard(sender, instance, **kwargs):
+    user_id = DASHBOARD_MODELS[sender](instance)
+    if user_id is not None:
+        invalidate_dashboard(user_id)
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(drop_cached_dashboard, sender=model, dispatch_uid=f"dashboard_save_{model.__name__}")
+    # Log deletions are left to their callers, as for tombstones above
+    if model is not GoalLog:
+        post_delete.connect(drop_cached_dashboard, sender=model, dispatch_uid=f"dashboard_delete_{model.__name__}")
+
+
+# Model -> owner lookup for rows behind cached API responses
+VERSIONED_MODELS = {
+    Goal: lambda goal: goal.user_id,
+    GoalLog: lambda log: log.user_id,
+    Submission: lambda submission: submission.user_id,
+    Wallet: lambda wallet: wallet.user_id,
+    WalletTransaction: _wallet_owner,
+}
+
+
+def bump_owner_version(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_data_versions([VERSIONED_MODELS[sender](instance)])
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_owner_version, sender=model, dispatch_uid=f"data_version_save_{model.__name__}")
+    if model is not GoalLog:
+        post_delete.connect(bump_owner_version, sender=model, dispatch_uid=f"data_version_delete_{model.__name__}")
+
+
+SEARCHED_GOAL_FIELDS = {"title", "description"}
+
+
+def index_goal(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SEARCHED_GOAL_FIELDS.intersection(update_fields)):
+        return
+    index_goals([instance.pkid])
+
+
+def index_text_submission(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_text_submissions([instance.pk])
+
+
+def unindex_goal(sender, instance, **kwargs):
+    unindex("goal", instance.pkid)
+
+
+def unindex_text_submission(sender, instance, **kwargs):
+    unindex("submission", instance.pk)
+
+
+def create_search_index(sender, **kwargs):
+    ensure_search_index()
+
+
+post_save.connect(index_goal, sender=Goal, dispatch_uid="search_index_goal")
+post_save.connect(index_text_submission, sender=TextSubmission, dispatch_uid="search_index_text_submission")
+post_delete.connect(unindex_goal, sender=Goal, dispatch_uid="search_unindex_goal")
+post_delete.connect(unindex_text_submission, sender=TextSubmission, dispatch_uid="search_unindex_text_submission")
+# post_migrate is sent once every app has migrated, so the indexed tables exist
+post_migrate.connect(create_search_index, sender=apps.get_app_config("common"), dispatch_uid="search_index")
@@ -0,0 +1,86 @@
+"""
+Delta sync for mobile clients.
+
+A sync token is a signed timestamp. Given one, only rows whose updated_at is
+after it are returned, together with tombstones for rows deleted since.
+Without one (or with one older than the tombstone retention window) the
+client gets a full snapshot and must replace its local copy.
+"""
+import datetime
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+from core_apps.goals.models import Goal
+from core_apps.goals.serializers import GoalSerializer
+from core_apps.logs.models import GoalLog
+from core_apps.logs.serializers import GoalLogListSerializer
+from core_apps.submissions.models import Submission
+from core_apps.submissions.serializers import SubmissionListSerializer
+from core_apps.wallets.models import Wallet, WalletTransaction
+from core_apps.wallets.serializers import WalletSerializer, WalletTransactionSerializer
+from core_apps.users.utils import user_local_date
+from .models import Tombstone
+
+TOKEN_SALT = "core_apps.common.sync"
+
+
+class InvalidSyncToken(Exception):
+    pass
+
+
+def make_token(moment):
+    return signing.dumps(moment.isoformat(), salt=TOKEN_SALT, compress=True)
+
+
+def read_token(token):
+    try:
+        return datetime.datetime.fromisoformat(signing.loads(token, salt=TOKEN_SALT))
+    except (signing.BadSignature, TypeError, ValueError):
+        raise InvalidSyncToken("Invalid sync token")
+
+
+def build_sync(user, token=None):
+    """Changes for `user` since `token` plus a token for the next call."""
+    now = timezone.now()
+    since = read_token(token) if token else None
+    retention = now - datetime.timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    reset = since is None or since < retention
+
+    goals = Goal.objects.filter(user=user)
+    logs = GoalLog.objects.filter(user=user)
+    submissions = Submission.objects.filter(user=user)
+    wallets = Wallet.objects.filter(user=user)
+    transactions = WalletTransaction.objects.filter(wallet__user=user)
+
+    if reset:
+        log_start = user_local_date(user) - datetime.timedelta(days=settings.SYNC_INITIAL_LOG_DAYS)
+        logs = logs.filter(date__gte=log_start)
+        deleted = {}
+    else:
+        # Progress counters live on their own row but are served with the goal
+        goals = goals.filter(Q(updated_at__gt=since) | Q(progress__updated_at__gt=since))
+        logs = logs.filter(updated_at__gt=since)
+        submissions = submissions.filter(updated_at__gt=since)
+        wallets = wallets.filter(updated_at__gt=since)
+        transactions = transactions.filter(updated_at__gt=since)
+        deleted = {}
+        for kind, object_id in Tombstone.objects.filter(
+            user=user, deleted_at__gt=since
+        ).values_list("kind", "object_id"):
+            deleted.setdefault(kind, []).append(object_id)
+
+    goals = goals.select_related("progress").prefetch_related("human_verifiers", "specific_date_entries")
+    wallet = wallets.first()
+    return {
+        "token": make_token(now - datetime.timedelta(seconds=settings.SYNC_TOKEN_OVERLAP_SECONDS)),
+        "reset": reset,
+        "goals": GoalSerializer(goals.distinct(), many=True).data,
+        "logs": GoalLogListSerializer(logs.select_related("goal"), many=True).data,
+        "submissions": SubmissionListSerializer(
+            submissions.select_related("goal_log", "goal_log__goal"), many=True
+        ).data,
+        "wallet": WalletSerializer(wallet).data if wallet else None,
+        "wallet_transactions": WalletTransactionSerializer(transactions, many=True).data,
+        "deleted": deleted,
+    }
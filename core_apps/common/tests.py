@@ -1,3 +1,189 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+import shutil
+import tempfile
+from urllib.parse import parse_qs, urlparse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.views import APIView
+from core_apps.common.cache import data_version, response_cache_enabled
+from core_apps.common.dashboard import dashboard_cache_key, get_dashboard, invalidate_dashboard
+from core_apps.common.pagination import GoalLogCursorPagination
+from core_apps.goals.models import Goal
+from core_apps.logs.models import GoalLog
 
-# Create your tests here.
+User = get_user_model()
+
+
+class GoalLogCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        user = User.objects.create_user(email="pages@example.com", username="pages", password="x")
+        self.busy_day = datetime.date(2025, 6, 2)
+        self.quiet_day = datetime.date(2025, 6, 1)
+        for index in range(7):
+            goal = Goal.objects.create(
+                user=user, title=f"Goal {index}", start_date=self.quiet_day, frequency="daily"
+            )
+            GoalLog.objects.create(goal=goal, date=self.busy_day, status="missed")
+            if index < 2:
+                GoalLog.objects.create(goal=goal, date=self.quiet_day, status="completed")
+        self.queryset = GoalLog.objects.filter(date__range=(self.quiet_day, self.busy_day))
+
+    def paginate(self, **params):
+        paginator = GoalLogCursorPagination()
+        request = Request(self.factory.get("/api/v1/logs/goal-logs/", params))
+        page = paginator.paginate_queryset(self.queryset, request)
+        return page, paginator.get_paginated_response([log.pkid for log in page]).data["next"]
+
+    def test_pages_through_rows_sharing_a_date_once_each(self):
+        seen = []
+        page, next_link = self.paginate(page_size=3)
+        seen.extend(page)
+        while next_link:
+            cursor = parse_qs(urlparse(next_link).query)["cursor"][0]
+            page, next_link = self.paginate(page_size=3, cursor=cursor)
+            seen.extend(page)
+
+        self.assertEqual(
+            [log.pkid for log in seen],
+            list(self.queryset.order_by("-date", "-pkid").values_list("pkid", flat=True)),
+        )
+        self.assertEqual(len(seen), 9)
+
+    def test_last_page_has_no_next_link(self):
+        page, next_link = self.paginate(page_size=9)
+
+        self.assertEqual(len(page), 9)
+        self.assertIsNone(next_link)
+
+    def test_tampered_cursor_is_rejected(self):
+        # Not base64 JSON, a value missing, and a value of the wrong type
+        tampered = ["not-a-cursor"] + [
+            base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            for values in (["2025-06-02"], ["not-a-date", 1])
+        ]
+        for cursor in tampered:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(cursor=cursor)
+
+
+LOCAL_CACHES = {
+    "locmem": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    "dummy": {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+}
+
+
+def shared_cache(directory):
+    return {"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": directory}}
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="home@example.com", username="home", password="x")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_not_cached_on_per_process_backends(self):
+        for name, caches in LOCAL_CACHES.items():
+            with self.subTest(backend=name), override_settings(CACHES=caches):
+                get_dashboard(self.user)
+                self.assertIsNone(cache.get(dashboard_cache_key(self.user.pk)))
+
+    def test_cached_on_a_shared_backend_until_invalidated(self):
+        with override_settings(CACHES=shared_cache(self.directory)):
+            data = get_dashboard(self.user)
+            with self.assertNumQueries(0):
+                self.assertEqual(get_dashboard(self.user), data)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_dashboard(self.user.pk)
+            self.assertIsNone(cache.get(dashboard_cache_key(self.user.pk)))
+
+
+class ResponseCacheTests(TestCase):
+    url = "/api/v1/goals/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="cached@example.com", username="cached", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+
+    def test_bypassed_on_per_process_backends(self):
+        for name, caches in LOCAL_CACHES.items():
+            with self.subTest(backend=name), override_settings(CACHES=caches):
+                self.assertFalse(response_cache_enabled())
+                for _ in range(2):
+                    response = self.client.get(self.url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotIn("X-Cache", response)
+
+    def test_write_bumps_the_version(self):
+        with override_settings(CACHES=shared_cache(self.directory)):
+            self.assertEqual(self.client.get(self.url)["X-Cache"], "MISS")
+            self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+            version = data_version(self.user.pk)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Goal.objects.create(
+                    user=self.user, title="New", start_date=datetime.date(2026, 1, 1), frequency="daily"
+                )
+
+            self.assertNotEqual(data_version(self.user.pk), version)
+            response = self.client.get(self.url)
+            self.assertEqual(response["X-Cache"], "MISS")
+            self.assertIn("New", response.content.decode())
+
+
+class WritingView(APIView):
+    def get(self, request, title):
+        Goal.objects.create(user=request.user, title=title, start_date=datetime.date(2026, 1, 1), frequency="daily")
+        return Response({"title": title})
+
+
+class FailingView(APIView):
+    def get(self, request):
+        goal = Goal.objects.create(
+            user=request.user, title="Rolled back", start_date=datetime.date(2026, 1, 1), frequency="daily"
+        )
+        GoalLog.objects.create(goal=goal, date=datetime.date(2025, 1, 1))
+        GoalLog.objects.create(goal=goal, date=datetime.date(2025, 1, 1))  # IntegrityError
+        return Response({})
+
+
+urlpatterns = [
+    path("api/v1/", include("core_apps.common.urls")),
+    path("batch-test/write/<str:title>/", WritingView.as_view()),
+    path("batch-test/fail/", FailingView.as_view()),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class BatchSavepointTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="batch@example.com", username="batch", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_failed_sub_request_rolls_back_only_its_own_writes(self):
+        with self.assertLogs("core_apps.common.batch", level="ERROR"):
+            response = self.client.post(
+                "/api/v1/batch/",
+                {"requests": ["/batch-test/write/Before/", "/batch-test/fail/", "/batch-test/write/After/"]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["status"] for result in response.data["data"]], [200, 500, 200])
+        self.assertCountEqual(
+            Goal.objects.filter(user=self.user).values_list("title", flat=True), ["Before", "After"]
+        )
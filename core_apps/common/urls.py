@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import BatchView, DashboardView, ResponseCacheStatsView, SearchView, SyncView
+
+
+urlpatterns = [
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("cache/stats/", ResponseCacheStatsView.as_view(), name="response-cache-stats"),
+    path("dashboard/", DashboardView.as_view(), name="dashboard"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("sync/", SyncView.as_view(), name="sync"),
+]
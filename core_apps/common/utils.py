@@ -1,6 +1,24 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
 from rest_framework.response import Response
 from rest_framework import status
 
+
+def uses_postgres():
+    return connection.vendor == "postgresql"
+
+
+def shared_cache_configured():
+    """
+    False when the default cache lives in each worker's own memory (or is a
+    dummy), so a key deleted or replaced in one worker would go unseen by the
+    rest.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
 def success_response(data=None, message="", status_code=status.HTTP_200_OK):
     return Response({
         "success": True,
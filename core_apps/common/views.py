@@ -1,3 +1,84 @@
-from django.shortcuts import render
+from rest_framework import status
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from .mixins import StandardResponseMixin
+from .batch import run_batch
+from .cache import cache_stats
+from .dashboard import get_dashboard
+from .pagination import NumberedPagination
+from .search import KINDS, search
+from .serializers import BatchRequestSerializer
+from .sync import InvalidSyncToken, build_sync
 
-# Create your views here.
+
+class SyncView(StandardResponseMixin, APIView):
+    """
+    Delta sync of goals, logs, submissions and wallet rows.
+    Query params: since (token from the previous sync; omit for a full snapshot)
+    """
+
+    def get(self, request):
+        try:
+            data = build_sync(request.user, request.query_params.get("since"))
+        except InvalidSyncToken as e:
+            return self.error_response(str(e), status_code=status.HTTP_400_BAD_REQUEST)
+        return self.success_response(data=data, message="Sync data retrieved successfully")
+
+
+class DashboardView(StandardResponseMixin, APIView):
+    """
+    Everything the home screen needs in one response: profile, active goals,
+    today's logs, pending submissions and wallet balance.
+    """
+
+    def get(self, request):
+        return self.success_response(
+            data=get_dashboard(request.user),
+            message="Dashboard retrieved successfully",
+        )
+
+
+class BatchView(StandardResponseMixin, APIView):
+    """
+    Run several GET requests against the API in one round-trip.
+    Body: {"requests": ["/api/v1/goals/", "/api/v1/logs/goal-logs/?goal_id=..."]}
+    Each result carries the path, status code and response body, in order.
+    """
+
+    def post(self, request):
+        serializer, error = self.validate_serializer(BatchRequestSerializer, request.data)
+        if error:
+            return error
+        results = run_batch(request, serializer.validated_data["requests"], excluded_views=(BatchView,))
+        return self.success_response(data=results, message="Batch completed")
+
+
+class SearchView(StandardResponseMixin, GenericAPIView):
+    """
+    Ranked full-text search over the user's goals and text submissions.
+    Query params: q (required), type (goal | submission; default both),
+    scope=all (staff only: search every user's rows), page, page_size
+    """
+    pagination_class = NumberedPagination
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return self.error_response("q is required", status_code=status.HTTP_400_BAD_REQUEST)
+        kind = request.query_params.get("type")
+        if kind and kind not in KINDS:
+            return self.error_response(f"type must be one of: {', '.join(KINDS)}")
+        everyone = request.user.is_staff and request.query_params.get("scope") == "all"
+
+        results = search(query, user=None if everyone else request.user, kinds=(kind,) if kind else KINDS)
+        page = self.paginate_queryset(results)
+        return self.paginated_response(page, message="Search results retrieved successfully")
+
+
+class ResponseCacheStatsView(StandardResponseMixin, APIView):
+    """Hit and miss counts for the per-user response cache (admin only)."""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return self.success_response(data=cache_stats(), message="Cache stats retrieved successfully")
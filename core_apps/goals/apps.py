@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class GoalsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core_apps.goals'
+
+    def ready(self):
+        from core_apps.goals import signals
@@ -0,0 +1,34 @@
+from django.apps import apps
+from django.db import models
+from django.db.models import Exists, F, OuterRef, Q
+
+
+class GoalQuerySet(models.QuerySet):
+    def active_on(self, day):
+        """Goals that are running on `day`."""
+        return self.filter(
+            Q(end_date__isnull=True) | Q(end_date__gte=day),
+            is_active=True,
+            is_completed=False,
+            start_date__lte=day,
+        )
+
+    def on_weekday(self, weekday):
+        """Goals whose weekday_mask has `weekday` set (0 = Monday), filtered in SQL."""
+        return self.annotate(
+            weekday_bit=F("weekday_mask").bitand(1 << weekday)
+        ).filter(weekday_bit__gt=0)
+
+    def on_specific_date(self, day):
+        """Goals with `day` among their specific dates, via the indexed date column."""
+        return self.filter(specific_date_entries__date=day)
+
+    def due_on(self, day):
+        """Goals with a fixed schedule that falls on `day`, in one query."""
+        GoalSpecificDate = apps.get_model("goals", "GoalSpecificDate")
+        return self.active_on(day).annotate(
+            weekday_bit=F("weekday_mask").bitand(1 << day.weekday())
+        ).filter(
+            Q(weekday_bit__gt=0)
+            | Q(Exists(GoalSpecificDate.objects.filter(goal=OuterRef("pkid"), date=day)))
+        )
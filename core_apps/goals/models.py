@@ -1,7 +1,11 @@
-from django.db import models
+import datetime
+from django.db import models, transaction
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from core_apps.common.models import TimeStampedUUIDModel
+from .managers import GoalQuerySet
+from .recurrence import date_ordinals, schedule_weekday_mask
 # from django.contrib.postgres.fields import ArrayField
 
 
@@ -43,9 +47,13 @@ class Goal(TimeStampedUUIDModel):
 
     weekdays = models.JSONField(null=True, blank=True)  # e.g. ["sunday","wednesday"]
     # weekdays = ArrayField(models.CharField(max_length=9), null=True, blank=True)  # e.g. ["sunday","wednesday"]
+    # Legacy storage; dates now live in GoalSpecificDate. Cleared by backfill_goal_schedules.
     specific_dates = models.JSONField(null=True, blank=True)  # e.g. ["2025-10-04", "2025-10-10"]
     # specific_dates = ArrayField(models.DateField(), null=True, blank=True)  # e.g. ["2025-10-04", "2025-10-10"]
     target_count = models.PositiveIntegerField(null=True, blank=True)  # e.g. 2 per week
+    # Bitmask of the weekdays the goal recurs on (bit 0 = Monday), derived from
+    # frequency/weekdays on save so due-on-weekday filtering can run in SQL
+    weekday_mask = models.PositiveSmallIntegerField(default=0, editable=False)
 
     penalty_amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     payment_method = models.CharField(
@@ -67,7 +75,143 @@ class Goal(TimeStampedUUIDModel):
         choices=VERIFICATION_TYPES,
         default="ai"
     )
+    # Weighted title + description, refreshed on save by core_apps.common.search
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = GoalQuerySet.as_manager()
+
+    SCHEDULE_FIELDS = {"frequency", "weekdays", "target_count", "start_date"}
 
     def __str__(self):
         return f"{self.title} ({self.user})"
-    
+
+    def save(self, *args, **kwargs):
+        # An empty weekday list means "no fixed days", the same as null
+        self.weekdays = self.weekdays or None
+        self.weekday_mask = schedule_weekday_mask(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.SCHEDULE_FIELDS.intersection(update_fields):
+            kwargs["update_fields"] = {*update_fields, "weekday_mask"}
+        super().save(*args, **kwargs)
+
+    @property
+    def verification_method(self):
+        """Older name for submission_method, still used by serializers and clients."""
+        return self.submission_method
+
+    @property
+    def scheduled_dates(self):
+        """Sorted specific dates, from the child table plus any not-yet-backfilled JSON."""
+        dates = list(self.specific_dates or [])
+        if self.pkid:
+            dates.extend(row.date for row in self.specific_date_entries.all())
+        return [datetime.date.fromordinal(o) for o in date_ordinals(dates)]
+
+    def set_specific_dates(self, dates):
+        """
+        Replace the goal's specific dates. The goal is saved afterwards so its
+        updated_at (and with it the compiled schedule and occurrences) moves on.
+        """
+        with transaction.atomic():
+            GoalSpecificDate.objects.filter(goal=self).delete()
+            GoalSpecificDate.objects.bulk_create(
+                [GoalSpecificDate(goal=self, date=day) for day in set(dates or [])],
+                ignore_conflicts=True,
+            )
+            self.specific_dates = None
+            getattr(self, "_prefetched_objects_cache", {}).pop("specific_date_entries", None)
+            self.save(update_fields=["specific_dates", "updated_at"])
+
+
+class GoalSpecificDate(models.Model):
+    """
+    One calendar date of a specific-days goal. Indexed on date so every goal
+    due on a given day is a single index lookup.
+    """
+    goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name="specific_date_entries")
+    date = models.DateField(db_index=True)
+
+    class Meta:
+        unique_together = ("goal", "date")
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.goal.title} - {self.date}"
+
+
+class GoalProgress(models.Model):
+    """
+    Running counters for a goal, updated on every GoalLog status change so due
+    checks and profile screens never have to aggregate log history.
+    """
+    goal = models.OneToOneField(Goal, on_delete=models.CASCADE, related_name="progress")
+    week_start = models.DateField(null=True, blank=True)  # Monday of the week week_completed counts
+    week_completed = models.PositiveIntegerField(default=0)
+    current_streak = models.PositiveIntegerField(default=0)
+    longest_streak = models.PositiveIntegerField(default=0)
+    total_completed = models.PositiveIntegerField(default=0)
+    total_missed = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.goal.title} progress ({self.current_streak} streak)"
+
+    def completed_in_week(self, week_start):
+        return self.week_completed if self.week_start == week_start else 0
+
+
+class GoalOccurrence(models.Model):
+    """
+    A day on which a goal is scheduled, materialized a rolling number of days
+    ahead so "what is due on D" is an indexed range scan on (date, goal).
+    """
+    goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name="occurrences")
+    date = models.DateField()
+
+    class Meta:
+        unique_together = ("goal", "date")
+        indexes = [models.Index(fields=["date", "goal"])]
+
+    def __str__(self):
+        return f"{self.goal.title} - {self.date}"
+
+
+class EvaluationShard(TimeStampedUUIDModel):
+    """
+    Checkpoint for one pkid range of a sharded evaluation run. A run that is
+    killed part way resumes from the shards that are not yet done.
+    """
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    run_date = models.DateField()
+    start_pkid = models.BigIntegerField()
+    end_pkid = models.BigIntegerField()  # exclusive
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    missed_count = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ("run_date", "start_pkid")
+        ordering = ["run_date", "start_pkid"]
+
+    def __str__(self):
+        return f"{self.run_date} [{self.start_pkid}, {self.end_pkid}) ({self.status})"
+
+
+class TimezoneCheckpoint(models.Model):
+    """
+    Last local day evaluated for users in one timezone. Hourly wave runs
+    evaluate every day after it that has since ended, so a late or skipped
+    run catches up instead of dropping the zone's day.
+    """
+    timezone = models.CharField(max_length=64, unique=True)
+    evaluated_through = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.timezone} through {self.evaluated_through}"
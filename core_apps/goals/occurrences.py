@@ -0,0 +1,116 @@
+import datetime
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from .models import Goal, GoalOccurrence
+from .recurrence import compile_schedule, week_bounds
+
+logger = logging.getLogger(__name__)
+
+# Past rows are kept for a couple of days so late evaluation runs still find them
+OCCURRENCE_RETENTION_DAYS = 2
+
+
+def _horizon(today=None, horizon_days=None):
+    today = today or timezone.now().date()
+    if horizon_days is None:
+        horizon_days = settings.GOAL_OCCURRENCE_HORIZON_DAYS
+    return today, today + datetime.timedelta(days=horizon_days)
+
+
+def _occurrence_rows(goal, start, end):
+    return [
+        GoalOccurrence(goal_id=goal.pkid, date=day)
+        for day in compile_schedule(goal).occurrences(start, end)
+    ]
+
+
+def rebuild_goal_occurrences(goal, today=None, horizon_days=None):
+    """Replace a goal's occurrences from today to the end of the horizon."""
+    start, end = _horizon(today, horizon_days)
+    with transaction.atomic():
+        GoalOccurrence.objects.filter(goal_id=goal.pkid, date__gte=start).delete()
+        if not goal.is_active or goal.is_completed:
+            return 0
+        rows = _occurrence_rows(goal, start, end)
+        GoalOccurrence.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def materialize_occurrences(today=None, horizon_days=None, chunk_size=1000):
+    """
+    Extend every active goal's occurrences to the end of the horizon and prune
+    rows that have aged out. Safe to re-run: existing rows are left untouched.
+    """
+    start, end = _horizon(today, horizon_days)
+    goals = Goal.objects.filter(is_active=True, is_completed=False, start_date__lte=end).filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=start)
+    ).only(
+        "pkid", "id", "updated_at", "frequency", "weekdays", "specific_dates",
+        "target_count", "start_date", "end_date",
+    ).prefetch_related("specific_date_entries")
+
+    written = 0
+    batch = []
+    for goal in goals.iterator(chunk_size=chunk_size):
+        batch.extend(_occurrence_rows(goal, start, end))
+        if len(batch) >= chunk_size:
+            GoalOccurrence.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        GoalOccurrence.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+
+    cutoff = start - datetime.timedelta(days=OCCURRENCE_RETENTION_DAYS)
+    pruned, _ = GoalOccurrence.objects.filter(date__lt=cutoff).delete()
+
+    logger.info(f"Materialized occurrences {start} to {end}: {written} rows written, {pruned} pruned.")
+    return written
+
+
+def goals_due_on(day):
+    """
+    Active goals with a fixed schedule that falls on `day`. Inside the
+    materialized window this is an indexed scan of GoalOccurrence; outside it
+    the weekday mask is filtered in SQL instead.
+    """
+    today = timezone.now().date()
+    window_start = today - datetime.timedelta(days=OCCURRENCE_RETENTION_DAYS)
+    window_end = today + datetime.timedelta(days=settings.GOAL_OCCURRENCE_HORIZON_DAYS)
+    if not window_start <= day <= window_end:
+        return Goal.objects.due_on(day)
+
+    return Goal.objects.filter(
+        occurrences__date=day,
+        is_active=True,
+        is_completed=False,
+    )
+
+
+def flexible_goals():
+    """
+    Active goals with a weekly target and no fixed days (weekdays null or
+    empty, both of which leave weekday_mask at 0). They cannot be materialized
+    ahead of time because being due depends on weekly progress.
+    """
+    return Goal.objects.filter(
+        is_active=True,
+        is_completed=False,
+        target_count__isnull=False,
+    ).filter(Q(frequency="count_based") | Q(frequency="weekly", weekday_mask=0))
+
+
+def due_flexible_goals(day):
+    """Weekly-target goals that still have attempts left in `day`'s week."""
+    week_start, _ = week_bounds(day)
+    return flexible_goals().annotate(
+        week_completed=Case(
+            When(progress__week_start=week_start, then=F("progress__week_completed")),
+            default=Value(0),
+        )
+    ).filter(week_completed__lt=F("target_count"))
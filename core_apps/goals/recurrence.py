@@ -0,0 +1,279 @@
+"""
+Closed-form recurrence rules for goals.
+
+A goal's frequency, weekdays, specific dates and start/end dates are compiled
+once into a GoalSchedule. The schedule answers "is it due on X", "which days
+in [a, b]", "how many days in [a, b]" and "next day after X" with weekday
+bitmask and integer week arithmetic instead of walking the calendar day by day.
+"""
+import bisect
+import datetime
+import heapq
+import json
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+DAY_NAMES = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+ALL_DAYS_MASK = 0b1111111
+
+
+def _weekday(ordinal):
+    # date.fromordinal(1) is a Monday, so ordinals line up with date.weekday()
+    return (ordinal - 1) % 7
+
+
+def _rotate(mask, shift):
+    """Rotate a 7-bit weekday mask right by `shift` days."""
+    shift %= 7
+    return ((mask >> shift) | (mask << (7 - shift))) & ALL_DAYS_MASK
+
+
+def weekday_mask_from_names(weekdays):
+    """
+    Build a weekday bitmask (bit 0 = Monday) from a list of day names.
+    Also accepts the legacy string form, e.g. "['monday', 'friday']".
+    """
+    if not weekdays:
+        return 0
+    if isinstance(weekdays, str):
+        try:
+            weekdays = json.loads(weekdays.replace("'", '"'))
+        except ValueError:
+            return 0
+    mask = 0
+    for name in weekdays:
+        name = str(name).strip().lower()
+        if name in DAY_NAMES:
+            mask |= 1 << DAY_NAMES.index(name)
+    return mask
+
+
+def date_ordinals(dates):
+    """Sorted, de-duplicated ordinals for a list of dates or ISO date strings."""
+    ordinals = set()
+    for value in dates or []:
+        if isinstance(value, str):
+            try:
+                value = datetime.date.fromisoformat(value)
+            except ValueError:
+                continue
+        ordinals.add(value.toordinal())
+    return tuple(sorted(ordinals))
+
+
+def week_bounds(day):
+    """Monday and Sunday of the week containing `day`."""
+    start = day - datetime.timedelta(days=day.weekday())
+    return start, start + datetime.timedelta(days=6)
+
+
+class GoalSchedule:
+    """
+    Compiled recurrence rule for a single goal.
+
+    A day is scheduled when it falls inside [start, end] and its weekday is set
+    in `weekday_mask` or its ordinal is listed in `dates`. Goals with only a
+    `target_count` have no fixed days; they are "flexible" and are due while the
+    weekly target has not been reached.
+    """
+
+    __slots__ = ("weekday_mask", "dates", "start", "end", "target_count")
+
+    def __init__(self, weekday_mask=0, dates=(), start=None, end=None, target_count=None):
+        self.weekday_mask = weekday_mask & ALL_DAYS_MASK
+        self.dates = tuple(dates)
+        self.start = start
+        self.end = end
+        self.target_count = target_count
+
+    def __repr__(self):
+        return (
+            f"GoalSchedule(weekday_mask={self.weekday_mask:#09b}, dates={len(self.dates)}, "
+            f"start={self.start}, end={self.end}, target_count={self.target_count})"
+        )
+
+    @property
+    def is_flexible(self):
+        return not self.weekday_mask and not self.dates and bool(self.target_count)
+
+    def _bounds(self, start, end):
+        """Clamp [start, end] to the goal's active window, as ordinals."""
+        if self.start and start < self.start:
+            start = self.start
+        if self.end and end > self.end:
+            end = self.end
+        if start > end:
+            return None
+        return start.toordinal(), end.toordinal()
+
+    def _extra_dates(self, lo, hi):
+        """Specific-date ordinals in [lo, hi] not already covered by the weekday mask."""
+        left = bisect.bisect_left(self.dates, lo)
+        right = bisect.bisect_right(self.dates, hi)
+        mask = self.weekday_mask
+        return [o for o in self.dates[left:right] if not mask >> _weekday(o) & 1]
+
+    def occurs_on(self, day):
+        if self._bounds(day, day) is None:
+            return False
+        ordinal = day.toordinal()
+        if self.weekday_mask >> _weekday(ordinal) & 1:
+            return True
+        index = bisect.bisect_left(self.dates, ordinal)
+        return index < len(self.dates) and self.dates[index] == ordinal
+
+    def count(self, start, end):
+        """Number of scheduled days in [start, end]."""
+        bounds = self._bounds(start, end)
+        if bounds is None:
+            return 0
+        lo, hi = bounds
+        total = 0
+        if self.weekday_mask:
+            full_weeks, remainder = divmod(hi - lo + 1, 7)
+            total = full_weeks * bin(self.weekday_mask).count("1")
+            if remainder:
+                window = _rotate((1 << remainder) - 1, -_weekday(lo))
+                total += bin(self.weekday_mask & window).count("1")
+        return total + len(self._extra_dates(lo, hi))
+
+    def _weekday_ordinals(self, lo, hi):
+        bits = [bit for bit in range(7) if self.weekday_mask >> bit & 1]
+        week_start = lo - _weekday(lo)
+        for monday in range(week_start, hi + 1, 7):
+            for bit in bits:
+                ordinal = monday + bit
+                if lo <= ordinal <= hi:
+                    yield ordinal
+
+    def occurrences(self, start, end):
+        """Yield scheduled dates in [start, end] in ascending order."""
+        bounds = self._bounds(start, end)
+        if bounds is None:
+            return
+        lo, hi = bounds
+        merged = heapq.merge(self._weekday_ordinals(lo, hi), self._extra_dates(lo, hi))
+        for ordinal in merged:
+            yield datetime.date.fromordinal(ordinal)
+
+    def next_after(self, day):
+        """First scheduled date strictly after `day`, or None."""
+        lo = day.toordinal() + 1
+        if self.start:
+            lo = max(lo, self.start.toordinal())
+        hi = self.end.toordinal() if self.end else None
+        candidates = []
+
+        if self.weekday_mask:
+            rotated = _rotate(self.weekday_mask, _weekday(lo))
+            candidates.append(lo + (rotated & -rotated).bit_length() - 1)
+
+        index = bisect.bisect_left(self.dates, lo)
+        if index < len(self.dates):
+            candidates.append(self.dates[index])
+
+        if not candidates:
+            return None
+        ordinal = min(candidates)
+        if hi is not None and ordinal > hi:
+            return None
+        return datetime.date.fromordinal(ordinal)
+
+
+class ScheduleCache:
+    """
+    Bounded, process-local LRU of compiled schedules keyed by
+    (goal.id, goal.updated_at). Saving a goal bumps updated_at, so stale
+    entries are never returned; they simply age out.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, goal):
+        if goal.updated_at is None:
+            # Unsaved goal: nothing stable to key on
+            return _compile(goal)
+
+        key = (goal.id, goal.updated_at)
+        with self._lock:
+            schedule = self._entries.get(key)
+            if schedule is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return schedule
+            self.misses += 1
+
+        schedule = _compile(goal)
+        with self._lock:
+            self._entries[key] = schedule
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return schedule
+
+    def info(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+schedule_cache = ScheduleCache(maxsize=settings.GOAL_SCHEDULE_CACHE_SIZE)
+
+
+def compile_schedule(goal):
+    """Compiled GoalSchedule for a goal, served from the process-local cache."""
+    return schedule_cache.get(goal)
+
+
+def schedule_weekday_mask(goal):
+    """
+    Weekday bitmask (bit 0 = Monday) of the days a goal recurs on, folding in
+    its frequency: every day for daily goals, the start weekday for weekly
+    goals with no explicit days, nothing for count-based goals.
+    """
+    if goal.frequency == "daily":
+        return ALL_DAYS_MASK
+    if goal.frequency == "weekly":
+        mask = weekday_mask_from_names(goal.weekdays)
+        if not mask and not goal.target_count:
+            # No explicit days: repeat on the weekday the goal started
+            mask = 1 << goal.start_date.weekday()
+        return mask
+    if goal.frequency == "specific_days":
+        return weekday_mask_from_names(goal.weekdays)
+    # count_based (and anything unknown) has no fixed days
+    return 0
+
+
+def _compile(goal):
+    """Compile a Goal's recurrence fields into a GoalSchedule."""
+    dates = ()
+    if goal.frequency == "specific_days":
+        dates = date_ordinals(goal.scheduled_dates)
+
+    return GoalSchedule(
+        weekday_mask=schedule_weekday_mask(goal),
+        dates=dates,
+        start=goal.start_date,
+        end=goal.end_date,
+        target_count=goal.target_count,
+    )
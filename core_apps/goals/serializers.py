@@ -1,11 +1,33 @@
+import datetime
+from collections import defaultdict
+from decimal import Decimal
 from rest_framework import serializers
-from .models import Goal
+from core_apps.common.serializers import SparseFieldsetMixin
+from .models import Goal, GoalProgress, GoalSpecificDate
+from .recurrence import date_ordinals
 from core_apps.verifications.serializers import HumanVerifierSerializer
 from core_apps.verifications.models import HumanVerifier
 
 
-class GoalSerializer(serializers.ModelSerializer):
+class GoalProgressSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = GoalProgress
+        fields = [
+            'week_start', 'week_completed', 'current_streak', 'longest_streak',
+            'total_completed', 'total_missed'
+        ]
+
+
+class GoalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     human_verifiers = HumanVerifierSerializer(many=True, required=False)
+    progress = GoalProgressSerializer(read_only=True)
+    specific_dates = serializers.ListField(
+        child=serializers.DateField(), source="scheduled_dates", required=False, allow_null=True
+    )
+    # The model field is submission_method; keep the name clients already use
+    verification_method = serializers.ChoiceField(
+        source="submission_method", choices=Goal.SUBMISSION_METHODS, required=False
+    )
     
     class Meta:
         model = Goal
@@ -13,20 +35,112 @@ class GoalSerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'start_date', 'end_date',
             'frequency', 'time_of_day', 'duration_minutes', 'weekdays',
             'specific_dates', 'target_count', 'penalty_amount', 'payment_method',
-            'verification_method', 'verification_type', 'human_verifiers'
+            'verification_method', 'verification_type', 'human_verifiers', 'progress'
         ]
+        expandable_fields = ['human_verifiers', 'progress']
     
     def create(self, validated_data):
         human_verifiers_data = validated_data.pop('human_verifiers', [])
+        specific_dates = validated_data.pop('scheduled_dates', None)
         goal = Goal.objects.create(**validated_data)
         
         for verifier_data in human_verifiers_data:
             HumanVerifier.objects.create(goal=goal, **verifier_data)
+
+        if specific_dates:
+            goal.set_specific_dates(specific_dates)
         
         return goal
 
+    def update(self, instance, validated_data):
+        specific_dates = validated_data.pop('scheduled_dates', None)
+        instance = super().update(instance, validated_data)
+        if specific_dates is not None:
+            instance.set_specific_dates(specific_dates)
+        return instance
+
+
+CENTS = Decimal("0.01")
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+class GoalRowSerializer:
+    """
+    Read-only fast path for goal lists with the same output as
+    GoalSerializer. Goals and their progress come from one .values() query,
+    verifiers and specific dates from one query each, and dicts are built
+    directly instead of through model instances and per-field
+    to_representation calls.
+    """
+    progress_fields = GoalProgressSerializer.Meta.fields
+    verifier_fields = HumanVerifierSerializer.Meta.fields
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def data(self):
+        rows = list(
+            self.queryset.prefetch_related(None).values(
+                "pkid", "id", "title", "description", "start_date", "end_date",
+                "frequency", "time_of_day", "duration_minutes", "weekdays",
+                "specific_dates", "target_count", "penalty_amount", "payment_method",
+                "submission_method", "verification_type", "progress__id",
+                *[f"progress__{name}" for name in self.progress_fields],
+            )
+        )
+        pkids = [row["pkid"] for row in rows]
+
+        verifiers = defaultdict(list)
+        for goal_id, *values in HumanVerifier.objects.filter(goal_id__in=pkids).values_list(
+            "goal_id", *self.verifier_fields
+        ):
+            verifiers[goal_id].append(dict(zip(self.verifier_fields, values)))
+
+        dates = defaultdict(list)
+        for goal_id, day in GoalSpecificDate.objects.filter(goal_id__in=pkids).values_list("goal_id", "date"):
+            dates[goal_id].append(day)
+
+        return [self.to_representation(row, verifiers[row["pkid"]], dates[row["pkid"]]) for row in rows]
+
+    def to_representation(self, row, verifiers, dates):
+        data = {
+            "id": str(row["id"]),
+            "title": row["title"],
+            "description": row["description"],
+            "start_date": _iso(row["start_date"]),
+            "end_date": _iso(row["end_date"]),
+            "frequency": row["frequency"],
+            "time_of_day": _iso(row["time_of_day"]),
+            "duration_minutes": row["duration_minutes"],
+            "weekdays": row["weekdays"],
+            "specific_dates": [
+                datetime.date.fromordinal(o).isoformat()
+                for o in date_ordinals((row["specific_dates"] or []) + dates)
+            ],
+            "target_count": row["target_count"],
+            "penalty_amount": str(Decimal(row["penalty_amount"]).quantize(CENTS)),
+            "payment_method": row["payment_method"],
+            "verification_method": row["submission_method"],
+            "verification_type": row["verification_type"],
+            "human_verifiers": verifiers,
+            # Goals nobody has logged against have no progress row yet
+            "progress": None,
+        }
+        if row["progress__id"] is not None:
+            data["progress"] = {name: row[f"progress__{name}"] for name in self.progress_fields}
+            data["progress"]["week_start"] = _iso(data["progress"]["week_start"])
+        return data
+
 
 class GoalBasicInfoSerializer(serializers.ModelSerializer):
+    specific_dates = serializers.ListField(
+        child=serializers.DateField(), required=False, allow_null=True
+    )
+
     class Meta:
         model = Goal
         fields = [
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from core_apps.logs.service import reconcile_pending_logs
+from .models import Goal
+from .occurrences import rebuild_goal_occurrences
+
+
+@receiver(post_save, sender=Goal)
+def rebuild_occurrences_on_save(sender, instance, raw=False, **kwargs):
+    """Keep the materialized schedule in step with the goal's recurrence fields."""
+    if raw:
+        return
+    rebuild_goal_occurrences(instance)
+
+
+@receiver(post_save, sender=Goal)
+def reconcile_pending_logs_on_save(sender, instance, raw=False, **kwargs):
+    """Drop or add pending logs when the schedule or active state changes."""
+    if raw:
+        return
+    reconcile_pending_logs(instance)
@@ -1,31 +1,295 @@
+import datetime
+import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+import django
+from django.contrib.auth import get_user_model
+from django.db import connections, transaction
+from django.db.models import Exists, Max, Min, OuterRef
 from django.utils import timezone
-from goals.models import Goal
+from core_apps.common.cache import bump_data_versions
+from core_apps.goals.models import Goal, EvaluationShard, TimezoneCheckpoint
+from core_apps.goals.occurrences import goals_due_on, flexible_goals, due_flexible_goals
 from core_apps.logs.models import GoalLog
+from core_apps.logs.progress import record_bulk_missed
+from core_apps.logs.rollups import record_bulk_missed_rollups
 from core_apps.verifications.models import Penalty
 from core_apps.goals.service import GoalEvaluator
+from core_apps.users.utils import get_timezone
 
-def evaluate_goals():
-    today = timezone.now().date()
-    goals = Goal.objects.filter(is_active=True, is_completed=False)
+User = get_user_model()
+logger = logging.getLogger(__name__)
 
-    for goal in goals:
-        evaluator = GoalEvaluator(goal)
+def evaluate_goals(day=None, bulk=False, chunk_size=1000, timezones=None):
+    today = day or timezone.now().date()
 
-        if evaluator.is_due_today():
+    if bulk:
+        return evaluate_goals_bulk(today, chunk_size=chunk_size, timezones=timezones)
+
+    # Fixed schedules come straight from the materialized occurrences; only
+    # weekly-target goals still need a Python due check.
+    due_goals = goals_due_on(today)
+    flexible = flexible_goals()
+    if timezones is not None:
+        due_goals = due_goals.filter(user__timezone__in=timezones)
+        flexible = flexible.filter(user__timezone__in=timezones)
+    candidates = chain(
+        ((goal, True) for goal in due_goals.select_related("user")),
+        ((goal, False) for goal in flexible.select_related("user")),
+    )
+
+    for goal, is_due in candidates:
+        evaluator = GoalEvaluator(goal, today=today)
+
+        if is_due or evaluator.is_due_today():
             # If not completed, mark missed
             if not evaluator.already_completed_today():
-                if not evaluator.already_logged_today():
+                log = GoalLog.objects.filter(goal=goal, date=today, status="pending", submission__isnull=True).first()
+                if log is not None:
+                    # Pre-created log that never got a submission
+                    log.status = "missed"
+                    log.save()
+                elif not evaluator.already_logged_today():
                     log = GoalLog.objects.create(
                         goal=goal,
                         date=today,
                         status="missed",
                         penalty_applied=False,
+                        user_id=goal.user_id,
+                    )
+                else:
+                    continue
+                if goal.penalty_amount > 0:
+                    Penalty.objects.create(
+                        goal_log=log,
+                        amount=goal.penalty_amount,
+                        reason="Missed goal"
                     )
-                    if goal.penalty_amount > 0:
-                        Penalty.objects.create(
-                            goal_log=log,
-                            amount=goal.penalty_amount,
-                            reason="Missed goal"
-                        )
-                        log.penalty_applied = True
-                        log.save()
+                    log.penalty_applied = True
+                    log.save()
+
+
+def evaluate_goals_bulk(day, chunk_size=1000, pkid_range=None, timezones=None):
+    """
+    Set-based version of evaluate_goals.
+
+    Due goals are walked in pkid order, `chunk_size` at a time, and each chunk
+    costs a fixed number of queries no matter how many goals it holds.
+    `pkid_range` restricts the run to goals with start <= pkid < end, and
+    `timezones` to goals whose owner lives in one of those timezones.
+    Returns the number of missed logs written.
+    """
+    missed = 0
+    for due in (goals_due_on(day), due_flexible_goals(day)):
+        if pkid_range:
+            due = due.filter(pkid__gte=pkid_range[0], pkid__lt=pkid_range[1])
+        if timezones is not None:
+            due = due.filter(user__timezone__in=timezones)
+        last_pkid = 0
+        while True:
+            goal_ids = list(
+                due.filter(pkid__gt=last_pkid)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:chunk_size]
+            )
+            if not goal_ids:
+                break
+            missed += _record_missed_chunk(goal_ids, day)
+            last_pkid = goal_ids[-1]
+    return missed
+
+
+def _record_missed_chunk(goal_ids, day):
+    """
+    Write missed logs and penalties for the goals in `goal_ids` that have no
+    log on `day`, or only a pending one nobody submitted against.
+    """
+    with transaction.atomic():
+        # Anti-join: due goals with no log at all for the day
+        unlogged = list(
+            Goal.objects.filter(pkid__in=goal_ids)
+            .exclude(Exists(GoalLog.objects.filter(goal=OuterRef("pkid"), date=day)))
+            .values_list("pkid", "user_id", "penalty_amount")
+        )
+        # Pending logs written ahead of time that never got a submission
+        unsubmitted = list(
+            GoalLog.objects.filter(
+                goal_id__in=goal_ids, date=day, status="pending", submission__isnull=True
+            ).values_list("pkid", "goal_id", "user_id", "penalty_amount")
+        )
+        if not unlogged and not unsubmitted:
+            return 0
+
+        if unsubmitted:
+            GoalLog.objects.filter(pkid__in=[log_id for log_id, _, _, _ in unsubmitted]).update(
+                status="missed", updated_at=timezone.now()
+            )
+        missed_ids = [goal_id for goal_id, _, _ in unlogged] + [goal_id for _, goal_id, _, _ in unsubmitted]
+
+        GoalLog.objects.bulk_create(
+            [
+                GoalLog(
+                    goal_id=goal_id,
+                    user_id=user_id,
+                    date=day,
+                    status="missed",
+                    penalty_applied=False,
+                    penalty_amount=penalty_amount,
+                )
+                for goal_id, user_id, penalty_amount in unlogged
+            ],
+            ignore_conflicts=True,
+        )
+        record_bulk_missed(missed_ids)
+        record_bulk_missed_rollups(
+            [(user_id, day, penalty_amount) for _, user_id, penalty_amount in unlogged]
+            + [(user_id, day, penalty_amount) for _, _, user_id, penalty_amount in unsubmitted]
+        )
+
+        penalised = list(
+            GoalLog.objects.filter(
+                goal_id__in=missed_ids,
+                date=day,
+                status="missed",
+                penalty_applied=False,
+                penalty_amount__gt=0,
+            ).values_list("pkid", "penalty_amount")
+        )
+        if penalised:
+            Penalty.objects.bulk_create(
+                [
+                    Penalty(goal_log_id=log_id, amount=amount, reason="Missed goal")
+                    for log_id, amount in penalised
+                ]
+            )
+            GoalLog.objects.filter(pkid__in=[log_id for log_id, _ in penalised]).update(
+                penalty_applied=True, updated_at=timezone.now()
+            )
+        bump_data_versions(
+            [user_id for _, user_id, _ in unlogged] + [user_id for _, _, user_id, _ in unsubmitted]
+        )
+    return len(missed_ids)
+
+
+def plan_evaluation_shards(day, shard_size):
+    """
+    Split the active-goal pkid keyspace into shards for `day`. Shards that were
+    already planned for the day are kept, so a resumed run only adds ranges for
+    goals created since.
+    """
+    bounds = Goal.objects.filter(is_active=True, is_completed=False).aggregate(
+        low=Min("pkid"), high=Max("pkid")
+    )
+    if bounds["low"] is None:
+        return
+    planned_end = EvaluationShard.objects.filter(run_date=day).aggregate(end=Max("end_pkid"))["end"]
+    start = max(bounds["low"], planned_end or 0)
+    EvaluationShard.objects.bulk_create(
+        [
+            EvaluationShard(run_date=day, start_pkid=low, end_pkid=low + shard_size)
+            for low in range(start, bounds["high"] + 1, shard_size)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _init_shard_worker():
+    # Connections inherited from the parent process must not be shared
+    django.setup()
+    connections.close_all()
+
+
+def evaluate_shard(shard_pkid, chunk_size=1000):
+    """Evaluate one shard and checkpoint the result. Runs inside a worker process."""
+    shard = EvaluationShard.objects.get(pkid=shard_pkid)
+    try:
+        missed = evaluate_goals_bulk(
+            shard.run_date,
+            chunk_size=chunk_size,
+            pkid_range=(shard.start_pkid, shard.end_pkid),
+        )
+    except Exception as e:
+        shard.status = "failed"
+        shard.error = str(e)
+        shard.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    shard.status = "done"
+    shard.missed_count = missed
+    shard.error = ""
+    shard.finished_at = timezone.now()
+    shard.save(update_fields=["status", "missed_count", "error", "finished_at", "updated_at"])
+    return missed
+
+
+def run_sharded_evaluation(day, workers=4, shard_size=50000, chunk_size=1000):
+    """
+    Evaluate all due goals for `day` across a process pool, one pkid shard per
+    task. Shards already marked done for `day` are skipped, so re-running after
+    a crash picks up where the last run stopped.
+    Returns (shards_run, shards_failed, missed_logs).
+    """
+    plan_evaluation_shards(day, shard_size)
+    shard_ids = list(
+        EvaluationShard.objects.filter(run_date=day).exclude(status="done").values_list("pkid", flat=True)
+    )
+    if not shard_ids:
+        return 0, 0, 0
+
+    # Workers open their own connections; don't hand them ours
+    connections.close_all()
+
+    failed = 0
+    missed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker) as pool:
+        futures = {pool.submit(evaluate_shard, shard_id, chunk_size): shard_id for shard_id in shard_ids}
+        for future in as_completed(futures):
+            try:
+                missed += future.result()
+            except Exception as e:
+                failed += 1
+                logger.error(f"Evaluation shard {futures[future]} failed: {str(e)}")
+    return len(shard_ids), failed, missed
+
+
+def timezone_waves(now=None):
+    """
+    Group the timezones in use by each local day that has ended there but has
+    not been evaluated yet, going by the zone's TimezoneCheckpoint. A zone
+    seen for the first time starts with the day that just ended. Unknown zone
+    names are evaluated on the UTC day, as user_local_date does for them.
+    Returns {local_date: [timezone names]} in date order.
+    """
+    now = now or timezone.now()
+    checkpoints = dict(TimezoneCheckpoint.objects.values_list("timezone", "evaluated_through"))
+    waves = defaultdict(list)
+    for name in User.objects.values_list("timezone", flat=True).distinct():
+        last_ended = now.astimezone(get_timezone(name)).date() - datetime.timedelta(days=1)
+        day = checkpoints[name] + datetime.timedelta(days=1) if name in checkpoints else last_ended
+        while day <= last_ended:
+            waves[day].append(name)
+            day += datetime.timedelta(days=1)
+    return dict(sorted(waves.items()))
+
+
+def evaluate_timezone_wave(now=None, chunk_size=1000):
+    """
+    Evaluate every local day that has ended and not yet been evaluated, per
+    timezone, and move each zone's checkpoint past it. Run hourly: the nightly
+    write burst is spread over 24 waves, and a late or skipped run (or a DST
+    jump over midnight) only delays a zone's day, it never drops it.
+    Returns {local_date: missed logs written}.
+    """
+    results = {}
+    for day, names in timezone_waves(now).items():
+        with transaction.atomic():
+            results[day] = evaluate_goals_bulk(day, chunk_size=chunk_size, timezones=names)
+            TimezoneCheckpoint.objects.bulk_create(
+                [TimezoneCheckpoint(timezone=name, evaluated_through=day) for name in names],
+                update_conflicts=True,
+                unique_fields=["timezone"],
+                update_fields=["evaluated_through", "updated_at"],
+            )
+        logger.info(f"Evaluated {day} for {len(names)} timezone(s): {results[day]} missed.")
+    return results
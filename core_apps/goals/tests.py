@@ -0,0 +1,239 @@
+import datetime
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from core_apps.goals.models import Goal, GoalProgress, TimezoneCheckpoint
+from core_apps.goals.recurrence import ScheduleCache, compile_schedule
+from core_apps.goals.tasks import _record_missed_chunk, evaluate_timezone_wave, timezone_waves
+from core_apps.logs.models import GoalLog, UserDailyRollup
+from core_apps.logs.service import backfill_goal_logs
+from core_apps.users.utils import user_local_date
+from core_apps.verifications.models import Penalty
+
+User = get_user_model()
+
+
+class GoalScheduleTests(SimpleTestCase):
+    # 2026-01-05 is a Monday
+    start = datetime.date(2026, 1, 5)
+
+    def schedule(self, **fields):
+        fields.setdefault("start_date", self.start)
+        return compile_schedule(Goal(title="Schedule", **fields))
+
+    def assertCountMatchesOccurrences(self, schedule):
+        first, last = datetime.date(2025, 12, 1), datetime.date(2026, 3, 31)
+        self.assertEqual(schedule.count(first, last), len(list(schedule.occurrences(first, last))))
+
+    def test_daily(self):
+        schedule = self.schedule(frequency="daily", end_date=datetime.date(2026, 1, 18))
+
+        self.assertTrue(schedule.occurs_on(self.start))
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 4)))
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 19)))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)), 14)
+        self.assertEqual(schedule.next_after(datetime.date(2026, 1, 10)), datetime.date(2026, 1, 11))
+        self.assertIsNone(schedule.next_after(datetime.date(2026, 1, 18)))
+        self.assertCountMatchesOccurrences(schedule)
+
+    def test_weekly_with_days(self):
+        schedule = self.schedule(frequency="weekly", weekdays=["monday", "thursday"])
+
+        self.assertTrue(schedule.occurs_on(datetime.date(2026, 1, 8)))
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 6)))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 18)), 4)
+        self.assertEqual(schedule.next_after(self.start), datetime.date(2026, 1, 8))
+        self.assertEqual(schedule.next_after(datetime.date(2026, 1, 8)), datetime.date(2026, 1, 12))
+        self.assertCountMatchesOccurrences(schedule)
+
+    def test_weekly_without_days_repeats_on_the_start_weekday(self):
+        wednesday = datetime.date(2026, 1, 7)
+        schedule = self.schedule(frequency="weekly", start_date=wednesday)
+
+        self.assertTrue(schedule.occurs_on(datetime.date(2026, 1, 21)))
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 8)))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)), 4)
+        self.assertEqual(schedule.next_after(wednesday), datetime.date(2026, 1, 14))
+        self.assertCountMatchesOccurrences(schedule)
+
+    def test_weekly_target_without_days_is_flexible(self):
+        schedule = self.schedule(frequency="weekly", target_count=3)
+
+        self.assertTrue(schedule.is_flexible)
+        self.assertFalse(schedule.occurs_on(self.start))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)), 0)
+        self.assertIsNone(schedule.next_after(self.start))
+
+    def test_specific_days(self):
+        schedule = self.schedule(
+            frequency="specific_days", specific_dates=["2026-02-01", "2026-01-10", "2026-01-03"]
+        )
+
+        self.assertTrue(schedule.occurs_on(datetime.date(2026, 1, 10)))
+        # Listed, but before the goal starts
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 3)))
+        self.assertFalse(schedule.occurs_on(datetime.date(2026, 1, 11)))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)), 1)
+        self.assertEqual(schedule.next_after(datetime.date(2026, 1, 10)), datetime.date(2026, 2, 1))
+        self.assertIsNone(schedule.next_after(datetime.date(2026, 2, 1)))
+        self.assertCountMatchesOccurrences(schedule)
+
+    def test_count_based(self):
+        schedule = self.schedule(frequency="count_based", target_count=2)
+
+        self.assertTrue(schedule.is_flexible)
+        self.assertFalse(schedule.occurs_on(self.start))
+        self.assertEqual(schedule.count(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31)), 0)
+        self.assertEqual(list(schedule.occurrences(datetime.date(2026, 1, 1), datetime.date(2026, 1, 31))), [])
+        self.assertIsNone(schedule.next_after(self.start))
+
+
+class RecordMissedChunkTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="missed@example.com", username="missed", password="x")
+        self.day = datetime.date(2026, 1, 5)
+
+    def create_goal(self, penalty_amount):
+        return Goal.objects.create(
+            user=self.user,
+            title=f"Goal with penalty {penalty_amount}",
+            start_date=self.day,
+            frequency="daily",
+            duration_minutes=30,
+            penalty_amount=penalty_amount,
+        )
+
+    def test_missed_goal_with_penalty_is_logged_and_penalised(self):
+        goal = self.create_goal(Decimal("25.00"))
+
+        self.assertEqual(_record_missed_chunk([goal.pkid], self.day), 1)
+
+        log = GoalLog.objects.get(goal=goal, date=self.day)
+        self.assertEqual(log.status, "missed")
+        self.assertTrue(log.penalty_applied)
+        penalty = Penalty.objects.get(goal_log=log)
+        self.assertEqual(penalty.amount, Decimal("25.00"))
+        self.assertEqual(penalty.penalty_type, "money")
+        self.assertIsNone(penalty.submission)
+
+    def test_pending_log_without_submission_is_penalised(self):
+        goal = self.create_goal(Decimal("10.00"))
+        log = GoalLog.objects.create(
+            goal=goal, date=self.day, status="pending", penalty_amount=goal.penalty_amount
+        )
+
+        self.assertEqual(_record_missed_chunk([goal.pkid], self.day), 1)
+
+        log.refresh_from_db()
+        self.assertEqual(log.status, "missed")
+        self.assertTrue(log.penalty_applied)
+        self.assertEqual(Penalty.objects.get(goal_log=log).amount, Decimal("10.00"))
+
+    def test_goal_without_penalty_is_only_logged(self):
+        goal = self.create_goal(Decimal("0"))
+
+        self.assertEqual(_record_missed_chunk([goal.pkid], self.day), 1)
+
+        log = GoalLog.objects.get(goal=goal, date=self.day)
+        self.assertFalse(log.penalty_applied)
+        self.assertFalse(Penalty.objects.exists())
+
+
+class TimezoneWaveTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(email="tokyo@example.com", username="tokyo", password="x", timezone="Asia/Tokyo")
+        User.objects.create_user(email="nowhere@example.com", username="nowhere", password="x", timezone="Nowhere/Zone")
+        # 12:30 on 2026-01-10 in Tokyo, 03:30 in UTC
+        self.now = datetime.datetime(2026, 1, 10, 3, 30, tzinfo=datetime.timezone.utc)
+
+    def test_first_run_evaluates_the_day_that_just_ended(self):
+        waves = timezone_waves(self.now)
+
+        self.assertEqual(list(waves), [datetime.date(2026, 1, 9)])
+        # The unknown zone falls back to the UTC day rather than being dropped
+        self.assertCountEqual(waves[datetime.date(2026, 1, 9)], ["Asia/Tokyo", "Nowhere/Zone"])
+
+    def test_checkpoint_stops_a_day_being_evaluated_twice(self):
+        evaluate_timezone_wave(self.now)
+
+        self.assertEqual(timezone_waves(self.now + datetime.timedelta(hours=1)), {})
+        self.assertEqual(
+            TimezoneCheckpoint.objects.get(timezone="Nowhere/Zone").evaluated_through, datetime.date(2026, 1, 9)
+        )
+
+    def test_skipped_runs_catch_up_every_ended_day(self):
+        evaluate_timezone_wave(self.now)
+
+        results = evaluate_timezone_wave(self.now + datetime.timedelta(days=3))
+
+        self.assertEqual(
+            list(results), [datetime.date(2026, 1, 10), datetime.date(2026, 1, 11), datetime.date(2026, 1, 12)]
+        )
+        self.assertEqual(
+            TimezoneCheckpoint.objects.get(timezone="Asia/Tokyo").evaluated_through, datetime.date(2026, 1, 12)
+        )
+
+
+class ScheduleCacheTests(SimpleTestCase):
+    def test_new_updated_at_recompiles(self):
+        cache = ScheduleCache(maxsize=10)
+        goal = Goal(
+            title="Cached",
+            start_date=datetime.date(2026, 1, 5),
+            frequency="daily",
+            updated_at=datetime.datetime(2026, 1, 5, 9, 0, tzinfo=datetime.timezone.utc),
+        )
+        first = cache.get(goal)
+        self.assertIs(cache.get(goal), first)
+
+        goal.frequency = "weekly"
+        goal.weekdays = ["friday"]
+        goal.updated_at += datetime.timedelta(seconds=1)
+        second = cache.get(goal)
+
+        self.assertIsNot(second, first)
+        self.assertFalse(second.occurs_on(datetime.date(2026, 1, 5)))
+        self.assertTrue(second.occurs_on(datetime.date(2026, 1, 9)))
+        self.assertEqual(cache.info()["hits"], 1)
+        self.assertEqual(cache.info()["misses"], 2)
+
+
+class GoalUpdateBackfillTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="edit@example.com", username="edit", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.today = user_local_date(self.user)
+        self.goal = Goal.objects.create(
+            user=self.user,
+            title="Monday run",
+            start_date=self.today - datetime.timedelta(days=28),
+            frequency="weekly",
+            weekdays=["monday"],
+            penalty_amount=Decimal("5.00"),
+        )
+        self.assertEqual(backfill_goal_logs(self.goal), 4)
+
+    def patch(self, data):
+        response = self.client.patch(f"/api/v1/goals/{self.goal.id}/", data, format="json")
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def missed_count(self):
+        return GoalLog.objects.filter(goal=self.goal, status="missed").count()
+
+    def test_schedule_change_does_not_rejudge_past_days(self):
+        self.patch({"frequency": "daily"})
+
+        self.assertEqual(self.missed_count(), 4)
+        self.assertEqual(GoalProgress.objects.get(goal=self.goal).total_missed, 4)
+        self.assertEqual(
+            UserDailyRollup.objects.filter(user=self.user).aggregate(total=Sum("missed_count"))["total"], 4
+        )
+
+    def test_earlier_start_date_backfills_only_the_uncovered_days(self):
+        self.patch({"frequency": "daily", "start_date": self.goal.start_date - datetime.timedelta(days=3)})
+
+        self.assertEqual(self.missed_count(), 7)
+        self.assertEqual(GoalProgress.objects.get(goal=self.goal).total_missed, 7)
@@ -6,10 +6,13 @@ from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIV
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from .models import Goal
-from core_apps.common.mixins import StandardResponseMixin
+from core_apps.common.mixins import CachedResponseMixin, SparseFieldsetViewMixin, StandardResponseMixin
+from core_apps.common.serializers import Shape
 from core_apps.verifications.models import HumanVerifier
+from core_apps.logs.service import backfill_goal_logs
+from core_apps.users.utils import user_local_date
 from .serializers import (
-    GoalSerializer, GoalBasicInfoSerializer, GoalHumanVerifierInfoSerializer,
+    GoalSerializer, GoalRowSerializer, GoalBasicInfoSerializer, GoalHumanVerifierInfoSerializer,
     GoalStakeInfoSerializer, GoalVerificationInfoSerializer)
 
 
@@ -40,6 +43,11 @@ class BaseGoalCreationView(StandardResponseMixin, APIView):
             goal_data['end_date'] = goal_data['end_date'].isoformat()
         if 'time_of_day' in goal_data and hasattr(goal_data['time_of_day'], 'isoformat'):
             goal_data['time_of_day'] = goal_data['time_of_day'].isoformat()
+        if goal_data.get('specific_dates'):
+            goal_data['specific_dates'] = [
+                day.isoformat() if hasattr(day, 'isoformat') else day
+                for day in goal_data['specific_dates']
+            ]
         
         cache.set(cache_key, goal_data, timeout=3600)
         return goal_data
@@ -202,6 +210,7 @@ class GoalCreateFinalView(BaseGoalCreationView):
             goal_data.pop('step', None)
             goal_data.pop('created_at', None)
             human_verifiers_data = goal_data.pop('human_verifiers', [])
+            specific_dates = goal_data.pop('specific_dates', None) or []
             
             # Convert string dates back to date objects
             if goal_data.get('start_date'):
@@ -220,10 +229,19 @@ class GoalCreateFinalView(BaseGoalCreationView):
             # Create the goal
             goal_data['user'] = request.user
             goal = Goal.objects.create(**goal_data)
+
+            # Specific dates go to their own indexed table
+            if specific_dates:
+                goal.set_specific_dates(
+                    [timezone.datetime.fromisoformat(day).date() for day in specific_dates]
+                )
             
             # Create human verifiers if any
             for verifier_data in human_verifiers_data:
                 HumanVerifier.objects.create(goal=goal, **verifier_data)
+
+            # Goals that start in the past get their history filled in
+            backfill_goal_logs(goal)
             
             # Clear cache
             cache.delete(self.get_cache_key())
@@ -252,26 +270,39 @@ class GoalCancelCreationView(StandardResponseMixin, APIView):
         return self.success_response(message='Goal creation cancelled successfully', status=status.HTTP_200_OK)
 
 
-class GoalListCreateView(StandardResponseMixin, ListCreateAPIView):
+# Serializer field -> queryset call that loads it
+GOAL_RELATIONS = {
+    "progress": ("select_related", "progress"),
+    "specific_dates": ("prefetch_related", "specific_date_entries"),
+    "human_verifiers": ("prefetch_related", "human_verifiers"),
+}
+
+
+class GoalListCreateView(StandardResponseMixin, CachedResponseMixin, SparseFieldsetViewMixin, ListCreateAPIView):
     queryset = Goal.objects.all()
     serializer_class = GoalSerializer
+    queryset_relations = GOAL_RELATIONS
 
     def get_queryset(self):
-        return Goal.objects.filter(user=self.request.user)
+        return self.with_requested_relations(Goal.objects.filter(user=self.request.user))
 
     def list(self, request, *args, **kwargs):
         try:
             queryset = self.filter_queryset(self.get_queryset())
-            serializer = self.get_serializer(queryset, many=True)
+            if Shape.from_request(request).unrestricted:
+                data = GoalRowSerializer(queryset).data
+            else:
+                data = self.get_serializer(queryset, many=True).data
             return self.success_response(
-                data=serializer.data,
+                data=data,
                 message="Goals retrieved successfully"
             )
         except Exception as e:
             return self.error_response(str(e), status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        goal = serializer.save(user=self.request.user)
+        backfill_goal_logs(goal)
 
     # def create(self, request, *args, **kwargs):
     #     try:
@@ -293,13 +324,22 @@ class GoalListCreateView(StandardResponseMixin, ListCreateAPIView):
 
 
 
-class GoalDetailView(StandardResponseMixin, RetrieveUpdateDestroyAPIView):
+class GoalDetailView(StandardResponseMixin, CachedResponseMixin, SparseFieldsetViewMixin, RetrieveUpdateDestroyAPIView):
     queryset = Goal.objects.all()
     serializer_class = GoalSerializer
     lookup_field = 'id'
+    queryset_relations = GOAL_RELATIONS
+
+    def get_queryset(self):
+        return self.with_requested_relations(Goal.objects.all())
 
     def perform_update(self, serializer):
-        serializer.save(user=self.request.user)
+        old_start = serializer.instance.start_date
+        goal = serializer.save(user=self.request.user)
+        # Days already judged stay as they are under the new schedule; only a
+        # start_date moved earlier uncovers days nobody has evaluated
+        if goal.start_date < old_start:
+            backfill_goal_logs(goal, start=goal.start_date, until=min(old_start, user_local_date(goal.user)))
 
     def retrieve(self, request, *args, **kwargs):
         try:
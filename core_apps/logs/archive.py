@@ -0,0 +1,168 @@
+"""
+Compact archive of settled goal log history.
+
+Each GoalLogArchive row holds one goal-year. Day N of the year (0-based) is
+stored in bits 2*(N % 4)..2*(N % 4)+1 of byte N // 4, so a whole year fits in
+92 bytes. Readers merge the archive with the hot GoalLog table; a hot row
+always wins over an archived one for the same day.
+"""
+import datetime
+import logging
+from collections import defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+from .models import GoalLog, GoalLogArchive
+
+logger = logging.getLogger(__name__)
+
+CODES = {"completed": 1, "missed": 2, "excused": 3}
+STATUSES = {code: status for status, code in CODES.items()}
+BITMAP_BYTES = 92  # 366 days * 2 bits
+
+
+def _day_index(day):
+    return day.timetuple().tm_yday - 1
+
+
+def pack(entries, bitmap=None):
+    """Write (date, status) pairs into a year bitmap, returning the new bytes."""
+    data = bytearray(bitmap or bytes(BITMAP_BYTES))
+    for day, status in entries:
+        index = _day_index(day)
+        shift = (index % 4) * 2
+        data[index // 4] = (data[index // 4] & ~(0b11 << shift)) | (CODES[status] << shift)
+    return bytes(data)
+
+
+def unpack(bitmap, year):
+    """Yield (date, status) for every archived day of `year`, in date order."""
+    data = bytes(bitmap)
+    first = datetime.date(year, 1, 1).toordinal()
+    for byte_index, byte in enumerate(data):
+        if not byte:
+            continue
+        for slot in range(4):
+            code = byte >> (slot * 2) & 0b11
+            if code:
+                yield datetime.date.fromordinal(first + byte_index * 4 + slot), STATUSES[code]
+
+
+def archive_cutoff(today=None):
+    """Logs dated before this day are old enough to be compacted."""
+    today = today or timezone.now().date()
+    return today - datetime.timedelta(days=settings.GOAL_LOG_ARCHIVE_AFTER_DAYS)
+
+
+def archived_statuses(goal_ids, start_date, end_date):
+    """{(goal pkid, date): status} from the archive for days in [start_date, end_date]."""
+    statuses = {}
+    archives = GoalLogArchive.objects.filter(
+        goal_id__in=goal_ids, year__range=(start_date.year, end_date.year)
+    ).values_list("goal_id", "year", "statuses")
+    for goal_id, year, bitmap in archives:
+        for day, status in unpack(bitmap, year):
+            if start_date <= day <= end_date:
+                statuses[(goal_id, day)] = status
+    return statuses
+
+
+def goal_history(goal, start_date, end_date):
+    """{date: status} for `goal` in [start_date, end_date], from the archive and the hot table."""
+    history = {
+        day: status
+        for (_, day), status in archived_statuses([goal.pkid], start_date, end_date).items()
+    }
+    history.update(
+        GoalLog.objects.filter(goal=goal, date__range=(start_date, end_date)).values_list("date", "status")
+    )
+    return dict(sorted(history.items()))
+
+
+def streaks(history):
+    """
+    (current, longest) run of completed days in a date-ordered {date: status}.
+    Missed days break a run; excused and pending days don't count either way.
+    """
+    current = longest = 0
+    for status in history.values():
+        if status == "completed":
+            current += 1
+            longest = max(longest, current)
+        elif status == "missed":
+            current = 0
+    return current, longest
+
+
+def _compactable(cutoff):
+    # Logs with submissions or penalty records stay in the hot table so the
+    # rows that reference them are never cascaded away
+    return GoalLog.objects.filter(
+        date__lt=cutoff,
+        status__in=list(CODES),
+        submission__isnull=True,
+        penalty_transactions__isnull=True,
+    )
+
+
+def compact_goal_logs(cutoff=None, chunk_size=1000):
+    """
+    Fold settled logs dated before `cutoff` into per goal-year archive rows
+    and delete them from GoalLog in batches. Each goal-year is archived and
+    deleted in one transaction, so an interrupted run loses nothing and a
+    re-run merges into the existing archive rows.
+    Returns (goal_years, logs_deleted).
+    """
+    cutoff = cutoff or archive_cutoff()
+    goal_years = list(
+        _compactable(cutoff)
+        .annotate(year=ExtractYear("date"))
+        .values_list("goal_id", "year")
+        .distinct()
+        .order_by("goal_id", "year")
+    )
+
+    deleted = 0
+    for goal_id, year in goal_years:
+        deleted += _compact_goal_year(goal_id, year, cutoff, chunk_size)
+
+    logger.info(f"Compacted {deleted} goal log(s) into {len(goal_years)} goal-year archive(s).")
+    return len(goal_years), deleted
+
+
+def _compact_goal_year(goal_id, year, cutoff, chunk_size):
+    end = min(datetime.date(year, 12, 31), cutoff - datetime.timedelta(days=1))
+    with transaction.atomic():
+        logs = list(
+            _compactable(cutoff)
+            .filter(goal_id=goal_id, date__range=(datetime.date(year, 1, 1), end))
+            .select_for_update(of=("self",))
+            .values_list("pkid", "user_id", "date", "status", "penalty_amount")
+        )
+        if not logs:
+            return 0
+
+        archive, _ = GoalLogArchive.objects.select_for_update().get_or_create(
+            goal_id=goal_id,
+            year=year,
+            defaults={"user_id": logs[0][1], "statuses": bytes(BITMAP_BYTES)},
+        )
+        archive.statuses = pack(
+            [(day, status) for _, _, day, status, _ in logs], archive.statuses
+        )
+        totals = defaultdict(int)
+        for _, status in unpack(archive.statuses, year):
+            totals[status] += 1
+        archive.completed_count = totals["completed"]
+        archive.missed_count = totals["missed"]
+        archive.excused_count = totals["excused"]
+        archive.penalty_total += sum(
+            amount or 0 for _, _, _, status, amount in logs if status == "missed"
+        )
+        archive.save()
+
+        pkids = [pkid for pkid, _, _, _, _ in logs]
+        for offset in range(0, len(pkids), chunk_size):
+            GoalLog.objects.filter(pkid__in=pkids[offset:offset + chunk_size]).delete()
+    return len(pkids)
@@ -0,0 +1,78 @@
+"""
+Month calendar of every goal a user has, one character per day.
+"""
+import calendar
+import datetime
+import hashlib
+from django.db.models import Count, Max
+from core_apps.goals.models import Goal
+from core_apps.goals.recurrence import compile_schedule
+from .archive import archive_cutoff, archived_statuses
+from .models import GoalLog, GoalLogArchive
+
+NOT_SCHEDULED = "."
+SCHEDULED = "s"
+STATUS_CODES = {
+    "completed": "c",
+    "missed": "m",
+    "excused": "e",
+    "pending": "p",
+}
+LEGEND = {NOT_SCHEDULED: "not scheduled", SCHEDULED: "scheduled, no log", **{v: k for k, v in STATUS_CODES.items()}}
+
+
+def month_bounds(month_start):
+    days = calendar.monthrange(month_start.year, month_start.month)[1]
+    return month_start, month_start.replace(day=days)
+
+
+def calendar_etag(user, month_start):
+    """
+    ETag for a user's month: changes whenever a log in the month or any of
+    the user's goals is written, added or removed.
+    """
+    start, end = month_bounds(month_start)
+    logs = GoalLog.objects.filter(user=user, date__range=(start, end)).aggregate(
+        latest=Max("updated_at"), count=Count("pkid")
+    )
+    goals = Goal.objects.filter(user=user).aggregate(latest=Max("updated_at"), count=Count("pkid"))
+    parts = [user.pk, start, logs["latest"], logs["count"], goals["latest"], goals["count"]]
+    if start < archive_cutoff():
+        archives = GoalLogArchive.objects.filter(user=user, year=start.year).aggregate(latest=Max("updated_at"))
+        parts.append(archives["latest"])
+    return '"%s"' % hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+
+
+def month_calendar(user, month_start):
+    """
+    [{id, title, days}] for every goal of `user`, where `days` has one
+    character per day of the month (see LEGEND). Costs one logs query plus
+    the goals and their specific dates.
+    """
+    start, end = month_bounds(month_start)
+    goals = list(
+        Goal.objects.filter(user=user).prefetch_related("specific_date_entries").order_by("created_at")
+    )
+
+    logged = {}
+    if start < archive_cutoff():
+        logged.update(archived_statuses([goal.pkid for goal in goals], start, end))
+    logged.update(
+        ((goal_id, day), log_status)
+        for goal_id, day, log_status in GoalLog.objects.filter(
+            user=user, date__range=(start, end)
+        ).values_list("goal_id", "date", "status")
+    )
+
+    offsets = range((end - start).days + 1)
+    rows = []
+    for goal in goals:
+        days = [NOT_SCHEDULED] * len(offsets)
+        for day in compile_schedule(goal).occurrences(start, end):
+            days[(day - start).days] = SCHEDULED
+        for offset in offsets:
+            log_status = logged.get((goal.pkid, start + datetime.timedelta(days=offset)))
+            if log_status:
+                days[offset] = STATUS_CODES.get(log_status, SCHEDULED)
+        rows.append({"id": goal.id, "title": goal.title, "days": "".join(days)})
+    return rows
@@ -0,0 +1,91 @@
+"""
+Streaming export of goal log history.
+
+Rows are read with .values_list().iterator(chunk_size), which uses a
+server-side cursor where the database supports one, and are encoded one at a
+time. Memory stays flat no matter how many logs are exported.
+"""
+import csv
+import datetime
+import json
+from decimal import Decimal
+from .models import GoalLog
+
+EXPORT_COLUMNS = [
+    ("log_id", "id"),
+    ("goal_id", "goal__id"),
+    ("goal_title", "goal__title"),
+    ("date", "date"),
+    ("status", "status"),
+    ("penalty_applied", "penalty_applied"),
+    ("penalty_amount", "penalty_amount"),
+    ("completion_time", "completion_time"),
+    ("submission_id", "submission__id"),
+    ("submission_status", "submission__status"),
+    ("submitted_at", "submission__submitted_at"),
+    ("verified_at", "submission__verified_at"),
+    ("penalty_status", "penalty_transactions__status"),
+    ("penalty_charged", "penalty_transactions__amount"),
+    ("penalty_created_at", "penalty_transactions__created_at"),
+]
+EXPORT_FIELDS = [name for name, _ in EXPORT_COLUMNS]
+
+
+def export_queryset(user=None, goal_id=None, start_date=None, end_date=None, status=None):
+    """
+    GoalLogs joined with their submission and penalty record, filtered like
+    UserGoalLogsView, in date order. Logs with no penalty record get empty
+    penalty columns.
+    """
+    queryset = GoalLog.objects.all()
+    if user is not None:
+        queryset = queryset.filter(user=user)
+    if goal_id:
+        queryset = queryset.filter(goal__id=goal_id)
+    if start_date:
+        queryset = queryset.filter(date__gte=start_date)
+    if end_date:
+        queryset = queryset.filter(date__lte=end_date)
+    if status:
+        queryset = queryset.filter(status=status)
+    return queryset.order_by("date", "pkid").values_list(*[lookup for _, lookup in EXPORT_COLUMNS])
+
+
+def _plain(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if value is not None and not isinstance(value, (str, int, float, bool)):
+        return str(value)  # UUIDs
+    return value
+
+
+def iter_rows(queryset, chunk_size=2000):
+    for values in queryset.iterator(chunk_size=chunk_size):
+        yield [_plain(value) for value in values]
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row))) + "\n"
+
+
+class _Echo:
+    """File-like object whose write() hands the line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(["" if value is None else value for value in row])
+
+
+ENCODERS = {
+    "ndjson": (ndjson_lines, "application/x-ndjson"),
+    "csv": (csv_lines, "text/csv"),
+}
@@ -0,0 +1,81 @@
+"""
+Scheduled days that have no completed log, found in SQL.
+
+A recursive CTE generates every calendar day of the reporting window. Each
+goal is joined to the days its schedule covers, either through its weekday
+mask or through its GoalSpecificDate rows. Days with a completed log are
+dropped with NOT EXISTS, so only the missing (goal, date) pairs are read
+back, never the log history itself.
+"""
+import datetime
+from django.db import connection
+from core_apps.goals.models import Goal, GoalSpecificDate
+from .archive import archived_statuses
+from .models import GoalLog
+
+# Generate [start, end] and number each day's weekday from 0 (Monday), to
+# line up with the bits of Goal.weekday_mask
+DAYS_SQL = {
+    "postgresql": (
+        "SELECT %s::date AS day UNION ALL SELECT (day + 1)::date FROM days WHERE day < %s::date",
+        "(EXTRACT(ISODOW FROM days.day)::integer - 1)",
+    ),
+    "sqlite": (
+        "SELECT date(%s) AS day UNION ALL SELECT date(day, '+1 day') FROM days WHERE day < %s",
+        "((CAST(strftime('%%w', days.day) AS integer) + 6) %% 7)",
+    ),
+}
+
+
+def _missed_sql(goal_count):
+    series, weekday = DAYS_SQL[connection.vendor]
+    goal, log, specific = Goal._meta.db_table, GoalLog._meta.db_table, GoalSpecificDate._meta.db_table
+    return f"""
+        WITH RECURSIVE days(day) AS ({series})
+        SELECT g.pkid, days.day,
+               (SELECT l.penalty_applied FROM {log} l WHERE l.goal_id = g.pkid AND l.date = days.day)
+        FROM {goal} g
+        JOIN days ON days.day >= g.start_date AND (g.end_date IS NULL OR days.day <= g.end_date)
+        WHERE g.pkid IN ({", ".join(["%s"] * goal_count)})
+          AND (
+            (g.weekday_mask & (1 << {weekday})) <> 0
+            OR (g.frequency = 'specific_days' AND EXISTS (
+                SELECT 1 FROM {specific} s WHERE s.goal_id = g.pkid AND s.date = days.day
+            ))
+          )
+          AND NOT EXISTS (
+            SELECT 1 FROM {log} l WHERE l.goal_id = g.pkid AND l.date = days.day AND l.status = 'completed'
+          )
+        ORDER BY g.pkid, days.day
+    """
+
+
+def find_missed_days(goals, end_date):
+    """
+    (goal, date, penalty_applied) for every scheduled day of `goals` from its
+    start_date up to end_date that has no completed log, in goal then date
+    order. One query, plus one against the archive; days completed in the
+    archive are dropped in Python.
+    """
+    goals = {goal.pkid: goal for goal in goals}
+    if not goals:
+        return []
+    start_date = min(goal.start_date for goal in goals.values())
+    if start_date > end_date:
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(_missed_sql(len(goals)), [start_date.isoformat(), end_date.isoformat(), *goals])
+        rows = cursor.fetchall()
+
+    archived = archived_statuses(list(goals), start_date, end_date)
+    missed = []
+    for goal_pkid, day, applied in rows:
+        if isinstance(day, str):
+            day = datetime.date.fromisoformat(day)
+        if applied is None and archived.get((goal_pkid, day)) == "completed":
+            # No hot log, and the archived one is completed
+            continue
+        # Archived logs never had penalty records, so their penalty is unapplied
+        missed.append((goals[goal_pkid], day, bool(applied)))
+    return missed
@@ -1,6 +1,11 @@
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from core_apps.goals.models import Goal
 from core_apps.common.models import TimeStampedUUIDModel
+from .progress import record_status_transition
 
 
 class GoalLog(TimeStampedUUIDModel):
@@ -12,6 +17,14 @@ class GoalLog(TimeStampedUUIDModel):
     ]
 
     goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name="logs")
+    # Copy of goal.user so per-user reads don't have to join through goals
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="goal_logs",
+        null=True,
+        editable=False,
+    )
     date = models.DateField()
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default="pending")
     penalty_applied = models.BooleanField(default=False)
@@ -24,13 +37,108 @@ class GoalLog(TimeStampedUUIDModel):
     class Meta:
         unique_together = ("goal", "date")
         ordering = ["-date"]
+        indexes = [
+            # Per-user reads in keyset pagination order
+            models.Index(fields=["user", "date", "pkid"]),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Status as loaded from the database, so save() can spot transitions
+        self._loaded_status = self.__dict__.get("status") if self.pkid else None
+
     #TODO change this to divide the total amount to multiple of the days
     def save(self, *args, **kwargs):
         # Set penalty amount from goal if not set
         if self.penalty_amount is None:
             self.penalty_amount = self.goal.penalty_amount
-        super().save(*args, **kwargs)
+        if self.user_id is None:
+            self.user_id = self.goal.user_id
+
+        previous = self._loaded_status
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != self.status:
+                record_status_transition(self, previous, self.status)
+                UserDailyRollup.apply_transition(self, previous, self.status)
+        self._loaded_status = self.status
 
     def __str__(self):
         return f"{self.goal.title} - {self.date} ({self.status})"
 
+
+class UserDailyRollup(models.Model):
+    """
+    Per-user, per-day totals of goal log outcomes, kept up to date as log
+    statuses change so analytics read one row per day instead of every log.
+    Drift (e.g. deleted logs) is repaired by the rebuild_daily_rollups command.
+    """
+    # Log status -> counter column
+    COUNTERS = {
+        "completed": "completed_count",
+        "missed": "missed_count",
+        "excused": "excused_count",
+    }
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="daily_rollups")
+    date = models.DateField()
+    completed_count = models.PositiveIntegerField(default=0)
+    missed_count = models.PositiveIntegerField(default=0)
+    excused_count = models.PositiveIntegerField(default=0)
+    # Sum of penalty_amount over the day's missed logs
+    penalty_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("user", "date")
+        ordering = ["-date"]
+
+    def __str__(self):
+        return f"{self.user} - {self.date}"
+
+    @classmethod
+    def apply_transition(cls, goal_log, previous, current):
+        """Move one log's contribution from `previous` to `current`. Call inside the saving transaction."""
+        changes = {}
+        for status, sign in ((previous, -1), (current, 1)):
+            field = cls.COUNTERS.get(status)
+            if field is None:
+                continue
+            changes[field] = changes.get(field, 0) + sign
+            if status == "missed" and goal_log.penalty_amount:
+                changes["penalty_total"] = changes.get("penalty_total", 0) + sign * goal_log.penalty_amount
+        changes = {field: delta for field, delta in changes.items() if delta}
+        if not changes or goal_log.user_id is None:
+            return
+
+        cls.objects.get_or_create(user_id=goal_log.user_id, date=goal_log.date)
+        cls.objects.filter(user_id=goal_log.user_id, date=goal_log.date).update(
+            **{field: Greatest(F(field) + delta, 0) for field, delta in changes.items()},
+            updated_at=timezone.now(),
+        )
+
+
+class GoalLogArchive(models.Model):
+    """
+    Settled history of one goal for one calendar year, compacted out of
+    GoalLog. `statuses` packs each day's status as a 2-bit code (see
+    core_apps.logs.archive); days with no archived log are 0.
+    """
+    goal = models.ForeignKey(Goal, on_delete=models.CASCADE, related_name="log_archives")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="log_archives")
+    year = models.PositiveSmallIntegerField()
+    statuses = models.BinaryField()
+    completed_count = models.PositiveIntegerField(default=0)
+    missed_count = models.PositiveIntegerField(default=0)
+    excused_count = models.PositiveIntegerField(default=0)
+    # Sum of penalty_amount over the archived missed logs
+    penalty_total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("goal", "year")
+        indexes = [models.Index(fields=["user", "year"])]
+        ordering = ["goal", "year"]
+
+    def __str__(self):
+        return f"{self.goal.title} - {self.year} (archived)"
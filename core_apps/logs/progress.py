@@ -0,0 +1,61 @@
+from django.db.models import F
+from django.utils import timezone
+from core_apps.goals.models import GoalProgress
+from core_apps.goals.recurrence import week_bounds
+
+
+def record_status_transition(goal_log, previous, current):
+    """
+    Apply one GoalLog status change to its goal's GoalProgress counters.
+    Call inside the transaction that saved the log.
+    """
+    if previous == current:
+        return
+
+    GoalProgress.objects.get_or_create(goal_id=goal_log.goal_id)
+    progress = GoalProgress.objects.select_for_update().get(goal_id=goal_log.goal_id)
+
+    log_week, _ = week_bounds(goal_log.date)
+    if progress.week_start is None or log_week > progress.week_start:
+        progress.week_start = log_week
+        progress.week_completed = 0
+    in_current_week = log_week == progress.week_start
+
+    if previous == "completed":
+        progress.total_completed = max(progress.total_completed - 1, 0)
+        progress.current_streak = max(progress.current_streak - 1, 0)
+        if in_current_week:
+            progress.week_completed = max(progress.week_completed - 1, 0)
+    elif previous == "missed":
+        progress.total_missed = max(progress.total_missed - 1, 0)
+
+    if current == "completed":
+        progress.total_completed += 1
+        progress.current_streak += 1
+        progress.longest_streak = max(progress.longest_streak, progress.current_streak)
+        if in_current_week:
+            progress.week_completed += 1
+    elif current == "missed":
+        progress.total_missed += 1
+        progress.current_streak = 0
+    # pending and excused days leave the streak alone
+
+    progress.save()
+
+
+def record_bulk_missed(goal_ids, count=1, reset_streak=True):
+    """
+    Counter update for logs inserted as missed in bulk (bulk_create skips save()).
+    `count` missed logs were written for each goal. Backfilled history sits
+    before the current streak, so callers writing it pass reset_streak=False.
+    """
+    if not goal_ids or not count:
+        return
+    GoalProgress.objects.bulk_create(
+        [GoalProgress(goal_id=goal_id) for goal_id in goal_ids],
+        ignore_conflicts=True,
+    )
+    changes = {"total_missed": F("total_missed") + count, "updated_at": timezone.now()}
+    if reset_streak:
+        changes["current_streak"] = 0
+    GoalProgress.objects.filter(goal_id__in=goal_ids).update(**changes)
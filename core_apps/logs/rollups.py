@@ -0,0 +1,138 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils import timezone
+from .archive import archive_cutoff
+from .models import GoalLog, UserDailyRollup
+
+logger = logging.getLogger(__name__)
+
+TRUNCATE = {
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+
+def record_bulk_missed_rollups(entries):
+    """
+    Rollup update for logs that became missed in bulk (bulk_create and
+    .update() skip save()). `entries` is an iterable of
+    (user_id, date, penalty_amount), one per log. Costs two queries.
+    """
+    totals = defaultdict(lambda: [0, Decimal("0")])
+    for user_id, day, penalty_amount in entries:
+        if user_id is None:
+            continue
+        totals[(user_id, day)][0] += 1
+        totals[(user_id, day)][1] += penalty_amount or 0
+    if not totals:
+        return
+
+    UserDailyRollup.objects.bulk_create(
+        [UserDailyRollup(user_id=user_id, date=day) for user_id, day in totals],
+        ignore_conflicts=True,
+    )
+    count_cases = [
+        When(user_id=user_id, date=day, then=Value(count))
+        for (user_id, day), (count, _) in totals.items()
+    ]
+    penalty_cases = [
+        When(user_id=user_id, date=day, then=Value(penalty))
+        for (user_id, day), (_, penalty) in totals.items()
+        if penalty
+    ]
+    changes = {
+        "missed_count": F("missed_count") + Case(*count_cases, default=Value(0), output_field=IntegerField()),
+        "updated_at": timezone.now(),
+    }
+    if penalty_cases:
+        changes["penalty_total"] = F("penalty_total") + Case(
+            *penalty_cases,
+            default=Value(Decimal("0")),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+    UserDailyRollup.objects.filter(
+        user_id__in={user_id for user_id, _ in totals},
+        date__in={day for _, day in totals},
+    ).update(**changes)
+
+
+def rebuild_rollups(start_date, end_date, chunk_size=1000):
+    """
+    Recompute every UserDailyRollup in [start_date, end_date] from GoalLog.
+    Days old enough to have been compacted into the archive are left alone.
+    Returns the number of rollup rows written.
+    """
+    start_date = max(start_date, archive_cutoff())
+    if start_date > end_date:
+        return 0
+    totals = (
+        GoalLog.objects.filter(date__range=(start_date, end_date), user__isnull=False)
+        .values("user_id", "date")
+        .annotate(
+            completed=Count("pkid", filter=Q(status="completed")),
+            missed=Count("pkid", filter=Q(status="missed")),
+            excused=Count("pkid", filter=Q(status="excused")),
+            penalty=Coalesce(
+                Sum("penalty_amount", filter=Q(status="missed")),
+                Value(Decimal("0")),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+        .order_by("date", "user_id")
+    )
+
+    written = 0
+    with transaction.atomic():
+        UserDailyRollup.objects.filter(date__range=(start_date, end_date)).delete()
+        batch = []
+        for row in totals.iterator(chunk_size=chunk_size):
+            if not (row["completed"] or row["missed"] or row["excused"]):
+                continue
+            batch.append(UserDailyRollup(
+                user_id=row["user_id"],
+                date=row["date"],
+                completed_count=row["completed"],
+                missed_count=row["missed"],
+                excused_count=row["excused"],
+                penalty_total=row["penalty"],
+            ))
+            if len(batch) >= chunk_size:
+                UserDailyRollup.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            UserDailyRollup.objects.bulk_create(batch)
+            written += len(batch)
+
+    logger.info(f"Rebuilt {written} daily rollup(s) for {start_date} to {end_date}.")
+    return written
+
+
+def rollup_trends(user, period, start_date, end_date):
+    """
+    Per-week or per-month totals for `user` in [start_date, end_date], read
+    from the daily rollups. Each bucket carries its completion rate over
+    decided (completed + missed) days.
+    """
+    buckets = (
+        UserDailyRollup.objects.filter(user=user, date__range=(start_date, end_date))
+        .annotate(period_start=TRUNCATE[period]("date"))
+        .values("period_start")
+        .annotate(
+            completed=Sum("completed_count"),
+            missed=Sum("missed_count"),
+            excused=Sum("excused_count"),
+            penalty_total=Sum("penalty_total"),
+        )
+        .order_by("period_start")
+    )
+    trends = []
+    for bucket in buckets:
+        decided = bucket["completed"] + bucket["missed"]
+        bucket["completion_rate"] = round(bucket["completed"] / decided, 4) if decided else None
+        trends.append(bucket)
+    return trends
@@ -1,9 +1,10 @@
 from rest_framework import serializers
+from core_apps.common.serializers import SparseFieldsetMixin
 from .models import GoalLog
 from core_apps.goals.serializers import GoalSerializer
 from core_apps.verifications.serializers import PenaltySerializer
 
-class GoalLogListSerializer(serializers.ModelSerializer):
+class GoalLogListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     goal_title = serializers.CharField(source="goal.title", read_only=True)
 
     class Meta:
@@ -11,11 +12,12 @@ class GoalLogListSerializer(serializers.ModelSerializer):
         fields = ["id", "goal", "goal_title", "date", "status", "penalty_applied"]
 
 
-class GoalLogDetailSerializer(serializers.ModelSerializer):
+class GoalLogDetailSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Detailed serializer with goal + penalties"""
     goal = GoalSerializer(read_only=True)
-    penalties = PenaltySerializer(many=True, read_only=True)
+    penalties = PenaltySerializer(source="penalty_transactions", many=True, read_only=True)
 
     class Meta:
         model = GoalLog
-        fields = ["id", "goal", "date", "status", "completed_at", "penalties"]
\ No newline at end of file
+        fields = ["id", "goal", "date", "status", "completion_time", "penalties"]
+        expandable_fields = ["goal", "penalties"]
@@ -0,0 +1,171 @@
+import datetime
+import logging
+import time
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from core_apps.common.cache import bump_data_versions
+from core_apps.common.models import Tombstone
+from core_apps.goals.models import Goal
+from core_apps.goals.recurrence import compile_schedule
+from core_apps.users.utils import user_local_date
+from .archive import archived_statuses
+from .models import GoalLog
+from .progress import record_bulk_missed
+from .rollups import record_bulk_missed_rollups
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_goal_logs(goal, until=None, start=None, chunk_size=1000):
+    """
+    Write missed logs for every scheduled day of `goal` from `start` (its
+    start_date by default) up to, but not including, `until` (the owner's local
+    today by default) that has no log yet. Penalties are left unapplied, as for
+    any log the evaluator did not write itself. Safe to re-run. Returns the
+    number of logs written.
+    """
+    if not goal.is_active:
+        return 0
+    start = max(start or goal.start_date, goal.start_date)
+    until = until or user_local_date(goal.user)
+    end = until - datetime.timedelta(days=1)
+    if start > end:
+        return 0
+
+    logged = set(
+        GoalLog.objects.filter(goal=goal, date__range=(start, end))
+        .values_list("date", flat=True)
+    )
+    logged.update(day for _, day in archived_statuses([goal.pkid], start, end))
+    rows = [
+        GoalLog(
+            goal_id=goal.pkid,
+            user_id=goal.user_id,
+            date=day,
+            status="missed",
+            penalty_applied=False,
+            penalty_amount=goal.penalty_amount,
+        )
+        for day in compile_schedule(goal).occurrences(start, end)
+        if day not in logged
+    ]
+    if not rows:
+        return 0
+
+    with transaction.atomic():
+        for offset in range(0, len(rows), chunk_size):
+            GoalLog.objects.bulk_create(rows[offset:offset + chunk_size], ignore_conflicts=True)
+        record_bulk_missed([goal.pkid], count=len(rows), reset_streak=False)
+        record_bulk_missed_rollups((goal.user_id, row.date, row.penalty_amount) for row in rows)
+        bump_data_versions([goal.user_id])
+
+    logger.info(f"Backfilled {len(rows)} missed log(s) for goal {goal.id} ({start} to {end}).")
+    return len(rows)
+
+
+def _pending_dates(goal, start, end):
+    schedule = compile_schedule(goal)
+    if schedule.is_flexible:
+        # Weekly-target goals aren't due on any particular day
+        return ()
+    return schedule.occurrences(start, end)
+
+
+def _create_pending_chunk(goals, days):
+    """Insert pending logs for one chunk of goals; returns the number of rows written."""
+    windows = {}
+    for goal in goals:
+        start = user_local_date(goal.user)
+        windows[goal.pkid] = (start, start + datetime.timedelta(days=days))
+    first = min(start for start, _ in windows.values())
+    last = max(end for _, end in windows.values())
+    logged = set(
+        GoalLog.objects.filter(goal_id__in=list(windows), date__range=(first, last))
+        .values_list("goal_id", "date")
+    )
+    rows = [
+        GoalLog(
+            goal_id=goal.pkid,
+            user_id=goal.user_id,
+            date=day,
+            status="pending",
+            penalty_amount=goal.penalty_amount,
+        )
+        for goal in goals
+        for day in _pending_dates(goal, *windows[goal.pkid])
+        if (goal.pkid, day) not in logged
+    ]
+    # A concurrent run may have inserted some of these since; the unique
+    # (goal, date) constraint turns those into no-ops
+    GoalLog.objects.bulk_create(rows, ignore_conflicts=True)
+    bump_data_versions({row.user_id for row in rows})
+    return len(rows)
+
+
+def precreate_pending_logs(days=None, chunk_size=1000):
+    """
+    Make sure every active goal with fixed days has a pending log for each
+    scheduled day from its owner's local today through `days` ahead, so submissions have a log to
+    attach to. Days that already have a log, whatever its status, are left
+    alone, so overlapping or repeated runs do no extra work.
+    Returns (rows_created, seconds_taken).
+    """
+    if days is None:
+        days = settings.GOAL_LOG_PRECREATE_DAYS
+    started = time.monotonic()
+    server_today = timezone.now().date()
+    # Owners' local dates are at most a day either side of the server's
+    goals = Goal.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=server_today - datetime.timedelta(days=1)),
+        is_active=True,
+        is_completed=False,
+        start_date__lte=server_today + datetime.timedelta(days=days + 1),
+    ).select_related("user").prefetch_related("specific_date_entries").order_by("pkid")
+
+    created = 0
+    chunk = []
+    for goal in goals.iterator(chunk_size=chunk_size):
+        chunk.append(goal)
+        if len(chunk) >= chunk_size:
+            created += _create_pending_chunk(chunk, days)
+            chunk = []
+    if chunk:
+        created += _create_pending_chunk(chunk, days)
+
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Pre-created {created} pending log(s) in {elapsed:.2f}s "
+        f"({created / elapsed if elapsed else 0:.0f} rows/s)."
+    )
+    return created, elapsed
+
+
+def reconcile_pending_logs(goal, days=None):
+    """
+    Bring `goal`'s pending logs from its owner's local today onwards in line
+    with its current schedule: drop the ones for days that are no longer due
+    (all of them once the goal is inactive or completed) and pre-create any
+    newly due days. Logs that already have a submission are left alone.
+    Returns (rows_created, rows_deleted).
+    """
+    if days is None:
+        days = settings.GOAL_LOG_PRECREATE_DAYS
+    today = user_local_date(goal.user)
+    schedule = compile_schedule(goal)
+    live = goal.is_active and not goal.is_completed and not schedule.is_flexible
+    pending = GoalLog.objects.filter(
+        goal_id=goal.pkid, date__gte=today, status="pending", submission__isnull=True
+    ).values_list("pkid", "id", "date")
+    stale = [(pkid, log_id) for pkid, log_id, day in pending if not (live and schedule.occurs_on(day))]
+
+    with transaction.atomic():
+        if stale:
+            GoalLog.objects.filter(pkid__in=[pkid for pkid, _ in stale]).delete()
+            # GoalLog has no delete receivers, so sync and caches are told here
+            Tombstone.record("logs", goal.user_id, [log_id for _, log_id in stale])
+            bump_data_versions([goal.user_id])
+        created = _create_pending_chunk([goal], days) if live else 0
+    return created, len(stale)
+
@@ -1,3 +1,149 @@
+import csv
+import datetime
+import io
+import json
+from decimal import Decimal
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+from core_apps.goals.models import Goal
+from core_apps.goals.recurrence import compile_schedule
+from core_apps.users.utils import user_local_date
+from core_apps.verifications.models import Penalty
+from .archive import pack
+from .models import GoalLog, GoalLogArchive
 
-# Create your tests here.
+User = get_user_model()
+
+
+class MissedGoalDaysViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="missed@example.com", username="missed", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.yesterday = user_local_date(self.user) - datetime.timedelta(days=1)
+        self.start = self.yesterday - datetime.timedelta(days=20)
+
+    def day(self, offset):
+        return self.start + datetime.timedelta(days=offset)
+
+    def create_goal(self, **fields):
+        return Goal.objects.create(
+            user=self.user, title=fields.pop("title", fields["frequency"]), start_date=self.start,
+            penalty_amount=Decimal("5.00"), **fields,
+        )
+
+    def get_missed(self):
+        response = self.client.get("/api/v1/logs/goal-logs/missed/")
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_reports_scheduled_days_without_a_completed_log(self):
+        daily = self.create_goal(frequency="daily")
+        weekly = self.create_goal(frequency="weekly", weekdays=["monday", "friday"])
+        specific = self.create_goal(frequency="specific_days")
+        specific.set_specific_dates([self.day(5), self.day(9), self.yesterday + datetime.timedelta(days=5)])
+        self.create_goal(frequency="count_based", target_count=2)
+
+        GoalLog.objects.create(goal=daily, date=self.day(1), status="completed")
+        GoalLog.objects.create(goal=daily, date=self.day(2), status="missed", penalty_applied=True)
+        GoalLog.objects.create(goal=daily, date=self.day(3), status="excused")
+        GoalLog.objects.create(goal=specific, date=self.day(9), status="completed")
+        # Completed, but compacted out of the hot table
+        GoalLogArchive.objects.create(
+            goal=daily, user=self.user, year=self.day(4).year, statuses=pack([(self.day(4), "completed")])
+        )
+
+        data = self.get_missed()
+
+        completed = {(daily.id, self.day(1)), (daily.id, self.day(4)), (specific.id, self.day(9))}
+        expected = [
+            (goal.id, day)
+            for goal in (daily, weekly, specific)
+            for day in compile_schedule(goal).occurrences(self.start, self.yesterday)
+            if (goal.id, day) not in completed
+        ]
+        self.assertEqual([(day["goal_id"], day["date"]) for day in data["missed_days"]], expected)
+        applied = [(day["goal_id"], day["date"]) for day in data["missed_days"] if day["penalty_applied"]]
+        self.assertEqual(applied, [(daily.id, self.day(2))])
+        self.assertEqual(data["total_penalty"], Decimal("5.00") * (len(expected) - 1))
+
+    def test_goal_starting_today_has_nothing_missed(self):
+        Goal.objects.create(
+            user=self.user, title="today", start_date=self.yesterday + datetime.timedelta(days=1), frequency="daily"
+        )
+
+        self.assertEqual(self.get_missed(), {"missed_days": [], "total_penalty": 0})
+
+
+class GoalCalendarViewTests(TestCase):
+    url = "/api/v1/logs/calendar/?month=2026-01"
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="calendar@example.com", username="calendar", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.goal = Goal.objects.create(
+            user=self.user, title="Daily", start_date=datetime.date(2026, 1, 1), frequency="daily"
+        )
+
+    def test_matching_if_none_match_gets_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        for header in (etag, f"W/{etag}", f'"stale", {etag}', "*"):
+            with self.subTest(header=header):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=header)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response["ETag"], etag)
+
+    def test_stale_etag_gets_the_calendar(self):
+        etag = self.client.get(self.url)["ETag"]
+        GoalLog.objects.create(goal=self.goal, date=datetime.date(2026, 1, 2), status="completed")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class GoalLogExportViewTests(TestCase):
+    url = "/api/v1/logs/goal-logs/export/"
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="export@example.com", username="export", password="x")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        goal = Goal.objects.create(
+            user=self.user, title="Daily", start_date=datetime.date(2026, 1, 1), frequency="daily"
+        )
+        self.missed = GoalLog.objects.create(
+            goal=goal, date=datetime.date(2026, 1, 1), status="missed", penalty_applied=True,
+            penalty_amount=Decimal("5.00"),
+        )
+        self.penalty = Penalty.objects.create(goal_log=self.missed, amount=Decimal("5.00"), status="executed")
+        self.completed = GoalLog.objects.create(goal=goal, date=datetime.date(2026, 1, 2), status="completed")
+
+    def export(self, export_format):
+        response = self.client.get(self.url, {"export_format": export_format, "end_date": "2026-01-31"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_ndjson_includes_the_penalty_record(self):
+        rows = [json.loads(line) for line in self.export("ndjson").splitlines()]
+
+        self.assertEqual([row["log_id"] for row in rows], [str(self.missed.id), str(self.completed.id)])
+        self.assertEqual(rows[0]["penalty_status"], "executed")
+        self.assertEqual(rows[0]["penalty_charged"], "5.00")
+        self.assertEqual(rows[0]["penalty_created_at"], self.penalty.created_at.isoformat())
+        self.assertIsNone(rows[1]["penalty_status"])
+        self.assertIsNone(rows[1]["penalty_charged"])
+
+    def test_csv_includes_the_penalty_record(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["penalty_status"], "executed")
+        self.assertEqual(rows[0]["penalty_charged"], "5.00")
+        self.assertEqual(rows[1]["penalty_status"], "")
+        self.assertEqual(rows[1]["status"], "completed")
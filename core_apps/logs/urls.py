@@ -1,12 +1,19 @@
 from django.urls import path
 
-from .views import GoalLogDetailView, GoalLogListView
+from .views import (
+    GoalCalendarView, GoalHistoryView, GoalLogAnalyticsView, GoalLogDetailView, GoalLogExportView, GoalLogListView,
+    MissedGoalDaysView)
 
 app_name = 'users'
 
 
 urlpatterns = [
     path("goal-logs/", GoalLogListView.as_view(), name="goal-log-list"),
+    path("goal-logs/export/", GoalLogExportView.as_view(), name="goal-log-export"),
+    path("goal-logs/missed/", MissedGoalDaysView.as_view(), name="goal-log-missed"),
+    path("calendar/", GoalCalendarView.as_view(), name="goal-log-calendar"),
+    path("analytics/", GoalLogAnalyticsView.as_view(), name="goal-log-analytics"),
+    path("goals/<uuid:goal_id>/history/", GoalHistoryView.as_view(), name="goal-history"),
     path("goal-logs/<uuid:id>/", GoalLogDetailView.as_view(), name="goal-log-detail"),
     #     path('goals/logs/', UserGoalLogsView.as_view(), name='user_goal_logs'),
     # path('goals/logs/<int:pk>/', GoalLogDetailView.as_view(), name='goal_log_detail'),
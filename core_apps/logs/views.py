@@ -1,9 +1,23 @@
+import datetime
+import uuid
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+from rest_framework.response import Response
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from core_apps.common.mixins import StandardResponseMixin
+from core_apps.common.mixins import CachedResponseMixin, SparseFieldsetViewMixin, StandardResponseMixin
+from core_apps.common.pagination import GoalLogCursorPagination
+from core_apps.goals.models import Goal
+from core_apps.users.utils import user_local_date
 from .models import GoalLog
+from .export import ENCODERS, export_queryset, iter_rows
+from .missed import find_missed_days
+from .rollups import TRUNCATE, rollup_trends
+from .archive import goal_history, streaks
+from .calendars import LEGEND, calendar_etag, month_calendar
 from .serializers import GoalLogListSerializer, GoalLogDetailSerializer
 
 # Create your views here.
@@ -13,11 +27,16 @@ from .serializers import GoalLogListSerializer, GoalLogDetailSerializer
 
 
 
-class GoalLogListView(StandardResponseMixin, ListAPIView):
+class GoalLogListView(StandardResponseMixin, CachedResponseMixin, SparseFieldsetViewMixin, ListAPIView):
     serializer_class = GoalLogListSerializer
+    pagination_class = GoalLogCursorPagination
+    queryset_relations = {
+        "goal_title": ("select_related", "goal"),
+    }
 
     def get_queryset(self):
-        queryset = GoalLog.objects.filter(goal__user=self.request.user).order_by("-date")
+        queryset = GoalLog.objects.filter(user=self.request.user).order_by("-date")
+        queryset = self.with_requested_relations(queryset)
 
         # Optional: filter by goal_id query param
         goal_id = self.request.query_params.get("goal_id")
@@ -27,22 +46,29 @@ class GoalLogListView(StandardResponseMixin, ListAPIView):
         return queryset
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return self.success_response(
-            data=serializer.data,
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
+        return self.paginated_response(
+            serializer.data,
             message="Goal logs retrieved successfully",
             status_code=status.HTTP_200_OK,
         )
 
 
-class GoalLogDetailView(StandardResponseMixin, RetrieveAPIView):
+class GoalLogDetailView(StandardResponseMixin, SparseFieldsetViewMixin, RetrieveAPIView):
     queryset = GoalLog.objects.all()
     serializer_class = GoalLogDetailSerializer
     lookup_field = 'id'
+    queryset_relations = {
+        "goal": ("select_related", "goal"),
+        "goal.progress": ("select_related", "goal__progress"),
+        "goal.specific_dates": ("prefetch_related", "goal__specific_date_entries"),
+        "goal.human_verifiers": ("prefetch_related", "goal__human_verifiers"),
+        "penalties": ("prefetch_related", "penalty_transactions"),
+    }
 
     def get_queryset(self):
-        return GoalLog.objects.filter(goal__user=self.request.user)
+        return self.with_requested_relations(GoalLog.objects.filter(user=self.request.user))
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -71,7 +97,7 @@ class UserGoalLogsView(ListAPIView):
         end_date = self.request.query_params.get('end_date')
         status_filter = self.request.query_params.get('status')
         
-        queryset = GoalLog.objects.filter(goal__user=user).select_related('goal')
+        queryset = GoalLog.objects.filter(user=user).select_related('goal')
         
         if goal_id:
             queryset = queryset.filter(goal_id=goal_id)
@@ -88,142 +114,201 @@ class UserGoalLogsView(ListAPIView):
         return queryset.order_by('-date')
     
 
-class GoalLogDetailView(RetrieveAPIView):
-    """
-    Get detailed information about a specific goal log including verification details
-    """
-    # permission_classes = [IsAuthenticated]
-    # serializer_class = GoalLogSerializer
-    
-    def get_queryset(self):
-        return GoalLog.objects.filter(goal__user=self.request.user)
-    
-    def retrieve(self, request, *args, **kwargs):
-        goal_log = self.get_object()
-        serializer = self.get_serializer(goal_log)
-        
-        # Add verification details based on goal's verification method
-        verification_data = self._get_verification_details(goal_log)
-        
-        response_data = serializer.data
-        response_data['verification_details'] = verification_data
-        
-        return Response(response_data)
-    
-    def _get_verification_details(self, goal_log):
-        """
-        Get verification details based on the goal's verification method
-        """
-        goal = goal_log.goal
-        verification_method = goal.verification_method
-        
-        if verification_method == 'text':
-            verifications = goal_log.text_verifications.all()
-            return TextVerificationSerializer(verifications, many=True).data
-        elif verification_method == 'photo':
-            verifications = goal_log.image_verifications.all()
-            return PhotoVerificationSerializer(verifications, many=True).data
-        elif verification_method == 'video':
-            verifications = goal_log.video_verifications.all()
-            return VideoVerificationSerializer(verifications, many=True).data
-        elif verification_method == 'friend':
-            verifications = goal_log.friend_verifications.all()
-            return FriendVerificationSerializer(verifications, many=True).data
-        
-        return []
-    
-
-
 class MissedGoalDaysView(APIView):
     """
-    Get all missed goal days and apply penalties if needed
+    Report scheduled days up to yesterday that have no completed log.
+    Read-only: writing missed logs and penalties is left to the evaluator.
     """
     # permission_classes = [IsAuthenticated]
+    goal_batch_size = 200
     
     def get(self, request):
         user = request.user
         goal_id = request.query_params.get('goal_id')
         
+        goals = Goal.objects.filter(user=user, is_active=True)
         if goal_id:
-            goals = Goal.objects.filter(id=goal_id, user=user, is_active=True)
-        else:
-            goals = Goal.objects.filter(user=user, is_active=True)
+            goals = goals.filter(id=goal_id)
+        goals = list(goals.order_by('pkid'))
         
         missed_days = []
-        today = date.today()
+        # Today is still open, so it can't be missed yet
+        end_date = user_local_date(user) - datetime.timedelta(days=1)
         
-        for goal in goals:
-            # Get all days that should have been completed
-            expected_dates = self._get_expected_dates(goal, today)
-            
-            for expected_date in expected_dates:
-                # Check if there's a completed log for this date
-                log_exists = GoalLog.objects.filter(
-                    goal=goal,
-                    date=expected_date,
-                    status='completed'
-                ).exists()
-                
-                if not log_exists:
-                    # Check if missed log already exists
-                    missed_log, created = GoalLog.objects.get_or_create(
-                        goal=goal,
-                        date=expected_date,
-                        defaults={'status': 'missed'}
-                    )
-                    
-                    missed_days.append({
-                        'goal_id': goal.id,
-                        'goal_title': goal.title,
-                        'date': expected_date,
-                        'penalty_amount': goal.penalty_amount,
-                        'penalty_applied': missed_log.penalty_applied
-                    })
+        for offset in range(0, len(goals), self.goal_batch_size):
+            batch = goals[offset:offset + self.goal_batch_size]
+            for goal, missed_date, penalty_applied in find_missed_days(batch, end_date):
+                missed_days.append({
+                    'goal_id': goal.id,
+                    'goal_title': goal.title,
+                    'date': missed_date,
+                    'penalty_amount': goal.penalty_amount,
+                    'penalty_applied': penalty_applied
+                })
         
         return Response({
             'missed_days': missed_days,
             'total_penalty': sum(day['penalty_amount'] for day in missed_days if not day['penalty_applied'])
         })
     
-    def _get_expected_dates(self, goal, end_date):
-        """
-        Calculate all dates when the goal should have been completed
-        """
-        expected_dates = []
-        current_date = goal.start_date
-        
-        while current_date <= end_date and (not goal.end_date or current_date <= goal.end_date):
-            if self._should_complete_on_date(goal, current_date):
-                expected_dates.append(current_date)
-            current_date += timedelta(days=1)
-        
-        return expected_dates
-    
-    def _should_complete_on_date(self, goal, check_date):
-        """
-        Check if goal should be completed on a specific date based on frequency
-        """
-        if goal.frequency == 'daily':
-            return True
-        elif goal.frequency == 'weekly':
-            # Assuming weekly goals should be completed on the same day of week as start_date
-            return check_date.weekday() == goal.start_date.weekday()
-        elif goal.frequency == 'specific_days':
-            # Parse weekdays from stored string (you might want to use ArrayField)
-            if goal.weekdays:
-                import json
-                try:
-                    weekdays = json.loads(goal.weekdays.replace("'", '"'))
-                    day_names = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-                    return day_names[check_date.weekday()] in weekdays
-                except:
-                    return False
-        elif goal.frequency == 'count_based':
-            # This would require more complex logic based on your requirements
-            return False
-        
-        return False
-    
+
+
+
+class GoalLogExportView(StandardResponseMixin, APIView):
+    """
+    Stream the user's full log history, joined with submission status and
+    penalty data, as NDJSON or CSV.
+    Query params: export_format (ndjson|csv), goal_id, start_date, end_date, status
+    """
+    chunk_size = 2000
+
+    def get(self, request):
+        export_format = request.query_params.get('export_format', 'ndjson')
+        if export_format not in ENCODERS:
+            return self.error_response(f"export_format must be one of: {', '.join(ENCODERS)}")
+
+        filters = {
+            'goal_id': request.query_params.get('goal_id'),
+            'start_date': request.query_params.get('start_date'),
+            'end_date': request.query_params.get('end_date'),
+            'status': request.query_params.get('status'),
+        }
+        try:
+            if filters['goal_id']:
+                uuid.UUID(filters['goal_id'])
+            for key in ('start_date', 'end_date'):
+                if filters[key]:
+                    filters[key] = datetime.date.fromisoformat(filters[key])
+        except ValueError:
+            return self.error_response("goal_id must be a UUID and dates must be YYYY-MM-DD")
+
+        encoder, content_type = ENCODERS[export_format]
+        rows = iter_rows(export_queryset(user=request.user, **filters), chunk_size=self.chunk_size)
+        response = StreamingHttpResponse(encoder(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="goal-logs.{export_format}"'
+        return response
+
+
+
+
+class GoalLogAnalyticsView(StandardResponseMixin, APIView):
+    """
+    Weekly or monthly completion trends, read from the daily rollups.
+    Query params: period (week|month), start_date, end_date
+    """
+    default_periods = 12
+
+    def get(self, request):
+        period = request.query_params.get('period', 'week')
+        if period not in TRUNCATE:
+            return self.error_response(f"period must be one of: {', '.join(TRUNCATE)}")
+
+        try:
+            end_date = request.query_params.get('end_date')
+            end_date = datetime.date.fromisoformat(end_date) if end_date else user_local_date(request.user)
+            start_date = request.query_params.get('start_date')
+            start_date = datetime.date.fromisoformat(start_date) if start_date else self._default_start(period, end_date)
+        except ValueError:
+            return self.error_response("Dates must be YYYY-MM-DD")
+        if start_date > end_date:
+            return self.error_response("start_date must not be after end_date")
+
+        return self.success_response(
+            data={
+                'period': period,
+                'start_date': start_date,
+                'end_date': end_date,
+                'trends': rollup_trends(request.user, period, start_date, end_date),
+            },
+            message="Analytics retrieved successfully",
+        )
+
+    def _default_start(self, period, end_date):
+        """Start of the period `default_periods - 1` periods before end_date's."""
+        if period == 'week':
+            monday = end_date - datetime.timedelta(days=end_date.weekday())
+            return monday - datetime.timedelta(weeks=self.default_periods - 1)
+        months = end_date.year * 12 + end_date.month - 1 - (self.default_periods - 1)
+        return datetime.date(months // 12, months % 12 + 1, 1)
+
+
+
+
+class GoalHistoryView(StandardResponseMixin, APIView):
+    """
+    Day-by-day status history and streaks of one goal, read from both the
+    live logs and the compacted archive.
+    Query params: start_date, end_date (default: the goal's start to today)
+    """
+
+    def get(self, request, goal_id):
+        goal = Goal.objects.filter(id=goal_id, user=request.user).first()
+        if goal is None:
+            return self.error_response("Goal not found", status_code=status.HTTP_404_NOT_FOUND)
+
+        try:
+            start_date = request.query_params.get('start_date')
+            start_date = datetime.date.fromisoformat(start_date) if start_date else goal.start_date
+            end_date = request.query_params.get('end_date')
+            end_date = datetime.date.fromisoformat(end_date) if end_date else user_local_date(request.user)
+        except ValueError:
+            return self.error_response("Dates must be YYYY-MM-DD")
+
+        # Streaks always cover the whole history, not just the requested window
+        today = user_local_date(request.user)
+        history = goal_history(goal, min(start_date, goal.start_date), max(end_date, today))
+        current_streak, longest_streak = streaks({day: s for day, s in history.items() if day <= today})
+        history = {day: s for day, s in history.items() if start_date <= day <= end_date}
+
+        return self.success_response(
+            data={
+                'goal_id': goal.id,
+                'start_date': start_date,
+                'end_date': end_date,
+                'current_streak': current_streak,
+                'longest_streak': longest_streak,
+                'days': [{'date': day, 'status': log_status} for day, log_status in history.items()],
+            },
+            message="Goal history retrieved successfully",
+        )
+
+
+
+
+class GoalCalendarView(StandardResponseMixin, APIView):
+    """
+    Month calendar of every goal, one status character per day.
+    Query params: month (YYYY-MM, default: the current month)
+    Sends an ETag; a matching If-None-Match gets a 304.
+    """
+
+    def get(self, request):
+        month = request.query_params.get('month')
+        try:
+            if month:
+                month_start = datetime.datetime.strptime(month, '%Y-%m').date()
+            else:
+                month_start = user_local_date(request.user).replace(day=1)
+        except ValueError:
+            return self.error_response("month must be YYYY-MM")
+
+        etag = calendar_etag(request.user, month_start)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified['ETag'] = etag
+            return not_modified
+
+        response = self.success_response(
+            data={
+                'month': month_start.strftime('%Y-%m'),
+                'legend': LEGEND,
+                'goals': month_calendar(request.user, month_start),
+            },
+            message="Calendar retrieved successfully",
+        )
+        response['ETag'] = etag
+        return response
+
 
 
 
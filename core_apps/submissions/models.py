@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils import timezone
 from core_apps.common.models import TimeStampedUUIDModel
@@ -19,6 +21,14 @@ class Submission(TimeStampedUUIDModel):
         on_delete=models.CASCADE, 
         related_name="submission"
     )
+    # Copy of goal_log.user so per-user reads don't have to join through logs and goals
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="submissions",
+        null=True,
+        editable=False,
+    )
     submitted_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=15, choices=SUBMISSION_STATUS, default="submitted")
     
@@ -35,8 +45,17 @@ class Submission(TimeStampedUUIDModel):
     
     # AI confidence score (0-1)
     ai_confidence_score = models.FloatField(null=True, blank=True)
+
+    class Meta(TimeStampedUUIDModel.Meta):
+        indexes = [
+            # Per-user reads in keyset pagination order
+            models.Index(fields=["user", "submitted_at", "pkid"]),
+        ]
     
     def save(self, *args, **kwargs):
+        if self.user_id is None:
+            self.user_id = self.goal_log.user_id or self.goal_log.goal.user_id
+
         # Update goal_log status based on submission status
         if self.status == "approved":
             self.goal_log.status = "completed"
@@ -60,6 +79,8 @@ class TextSubmission(models.Model):
         related_name="text_content"
     )
     content = models.TextField()
+    # Refreshed on save by core_apps.common.search
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return f"Text: {self.content[:50]}..."
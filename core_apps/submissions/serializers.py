@@ -1,13 +1,15 @@
 from rest_framework import serializers
 from datetime import date
 from rest_framework.exceptions import ValidationError
+from core_apps.common.serializers import SparseFieldsetMixin
 from core_apps.goals.models import Goal
 from .models import TextSubmission, PhotoSubmission, VideoSubmission, Submission
 from django.core.files.uploadedfile import UploadedFile
 from core_apps.logs.models import GoalLog
+from core_apps.users.utils import user_local_date
 
 
-class GoalLogSerializer(serializers.ModelSerializer):
+class GoalLogSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Basic goal log info for submission"""
     goal_title = serializers.CharField(source='goal.title', read_only=True)
     verification_method = serializers.CharField(source='goal.verification_method', read_only=True)
@@ -86,7 +88,7 @@ class PhotoSubmissionSerializer(serializers.ModelSerializer):
         return value
 
 
-class SubmissionSerializer(serializers.ModelSerializer):
+class SubmissionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Main submission serializer"""
     goal_log = GoalLogSerializer(read_only=True)
     goal_log_id = serializers.UUIDField(write_only=True)
@@ -109,6 +111,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
             'verification_method',
             'text_content', 'photo_content', 'video_content',
         ]
+        expandable_fields = ['goal_log', 'text_content', 'photo_content', 'video_content']
         read_only_fields = [
             'id', 'submitted_at', 'status', 'verified_by', 
             'verified_at', 'verification_notes', 'ai_confidence_score'
@@ -126,7 +129,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
             raise ValidationError("Goal log not found")
         
         # Check if goal log belongs to the authenticated user
-        if goal_log.goal.user != request.user:
+        if goal_log.user_id != request.user.pk:
             raise ValidationError("You can only submit for your own goals")
         
         # Check if goal log is in pending status
@@ -139,7 +142,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
             raise ValidationError("Submission already exists for this goal log")
         
         # Check if submission is on time (not too late)
-        days_late = (date.today() - goal_log.date).days
+        days_late = (user_local_date(request.user) - goal_log.date).days
         if days_late > 1:  # Allow submissions up to 1 days late
             raise ValidationError("Submission is too late (more than 1 days)")
         
@@ -209,7 +212,7 @@ class SubmissionSerializer(serializers.ModelSerializer):
 
 
 
-class SubmissionListSerializer(serializers.ModelSerializer):
+class SubmissionListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Simplified serializer for listing submissions"""
     goal_title = serializers.CharField(source='goal_log.goal.title', read_only=True)
     goal_date = serializers.DateField(source='goal_log.date', read_only=True)
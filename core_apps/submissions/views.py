@@ -1,25 +1,37 @@
 from rest_framework.generics import ListCreateAPIView, RetrieveAPIView
 from rest_framework import permissions
 from django.db import transaction
+from core_apps.common.mixins import SparseFieldsetViewMixin
+from core_apps.common.pagination import SubmissionCursorPagination
 from core_apps.verifications.tasks import process_ai_verification, send_verification_reminder
 from .serializers import SubmissionSerializer, SubmissionListSerializer
 from .models import Submission
 
 
-class SubmissionListCreateView(ListCreateAPIView):
+# Serializer field -> queryset call that loads it
+SUBMISSION_RELATIONS = {
+    "goal_log": ("select_related", "goal_log__goal"),
+    "goal_title": ("select_related", "goal_log__goal"),
+    "goal_date": ("select_related", "goal_log"),
+    "verification_method": ("select_related", "goal_log__goal"),
+    "text_content": ("select_related", "text_content"),
+    "photo_content": ("select_related", "photo_content"),
+    "video_content": ("select_related", "video_content"),
+}
+
+
+class SubmissionListCreateView(SparseFieldsetViewMixin, ListCreateAPIView):
     """
     List user's submissions and create new submissions
     """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SubmissionCursorPagination
+    queryset_relations = SUBMISSION_RELATIONS
     
     def get_queryset(self):
         """Return submissions for authenticated user only"""
-        return Submission.objects.filter(
-            goal_log__goal__user=self.request.user
-        ).select_related(
-            'goal_log', 'goal_log__goal'
-        ).prefetch_related(
-            'text_content', 'photo_content', 'video_content', 'friend_content'
+        return self.with_requested_relations(
+            Submission.objects.filter(user=self.request.user)
         ).order_by('-submitted_at')
     
     def get_serializer_class(self):
@@ -63,21 +75,18 @@ class SubmissionListCreateView(ListCreateAPIView):
             send_verification_reminder.delay(submission.id, verifier.id)
 
 
-class SubmissionDetailView(RetrieveAPIView):
+class SubmissionDetailView(SparseFieldsetViewMixin, RetrieveAPIView):
     """
     Get submission details
     """
     serializer_class = SubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    queryset_relations = SUBMISSION_RELATIONS
     
     def get_queryset(self):
         """Return submissions for authenticated user only"""
-        return Submission.objects.filter(
-            goal_log__goal__user=self.request.user
-        ).select_related(
-            'goal_log', 'goal_log__goal'
-        ).prefetch_related(
-            'text_content', 'photo_content', 'video_content', 'friend_content'
+        return self.with_requested_relations(
+            Submission.objects.filter(user=self.request.user)
         )
     
     def get_serializer_context(self):
@@ -35,6 +35,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     provider_id = models.CharField(max_length=100, blank=True, null=True)
     avatar_url = models.URLField(blank=True, null=True)
 
+    # IANA name, e.g. "Africa/Lagos". Decides where the user's day starts and ends.
+    timezone = models.CharField(max_length=64, default="UTC", db_index=True)
+
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = ["username"]
     objects = CustomUserManager()
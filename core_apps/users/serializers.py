@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 from .models import EmailVerificationCode
 from .utils import send_verification_email
 from django.contrib.auth.password_validation import validate_password
+from zoneinfo import available_timezones
 
 
 User = get_user_model()
@@ -154,5 +155,10 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ('id', 'email', 'first_name', 'last_name', 'date_joined', 'avatar_url')
-        read_only_fields = ('id', 'email', 'date_joined')
\ No newline at end of file
+        fields = ('id', 'email', 'first_name', 'last_name', 'date_joined', 'avatar_url', 'timezone')
+        read_only_fields = ('id', 'email', 'date_joined')
+
+    def validate_timezone(self, value):
+        if value not in available_timezones():
+            raise serializers.ValidationError("Unknown timezone.")
+        return value
\ No newline at end of file
@@ -2,7 +2,9 @@
 from django.core.mail import send_mail
 from django.conf import settings
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import logging
 
 logger = logging.getLogger(__name__)
@@ -89,4 +91,29 @@ def send_welcome_email(user):
 
     except Exception as e:
         logger.error(f"Failed to send welcome email to {user.email}: {str(e)}")
-        return False
\ No newline at end of file
+        return False
+
+
+def get_timezone(name):
+    """
+    Return the ZoneInfo for a timezone name, falling back to UTC for unknown names
+    """
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def get_user_timezone(user):
+    """
+    Return the user's ZoneInfo, falling back to UTC for unknown names
+    """
+    return get_timezone(getattr(user, "timezone", None))
+
+
+def user_local_date(user, now=None):
+    """
+    Today's date in the user's own timezone
+    """
+    now = now or timezone.now()
+    return now.astimezone(get_user_timezone(user)).date()
@@ -234,3 +234,14 @@ class UserProfileView(StandardResponseMixin, GenericAPIView):
             data=user_data,
             message="Profile retrieved successfully."
         )
+
+    def patch(self, request):
+        serializer = UserProfileSerializer(request.user, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return self.error_response(self.format_serializer_errors(serializer.errors))
+
+        serializer.save()
+        return self.success_response(
+            data=serializer.data,
+            message="Profile updated successfully."
+        )
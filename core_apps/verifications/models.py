@@ -25,20 +25,6 @@ class HumanVerifier(TimeStampedUUIDModel):
         return f"{self.name} - {self.contact_value} for {self.goal.title}"
     
 
-class Penalty(TimeStampedUUIDModel):
-    goal_log = models.ForeignKey(
-        GoalLog, 
-        on_delete=models.CASCADE, 
-        related_name="penalty_transactions"
-    )
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
-    reason = models.CharField(max_length=255, default="Missed goal")
-    applied_at = models.DateTimeField(auto_now_add=True)
-
-    def __str__(self):
-        return f"Penalty {self.amount} for {self.goal_log}"
-    
-
 class Penalty(TimeStampedUUIDModel):
     """
     A generic penalty linked to a user. 
@@ -55,13 +41,18 @@ class Penalty(TimeStampedUUIDModel):
         on_delete=models.CASCADE, 
         related_name="penalty_transactions"
     )
+    # Missed goals are penalised without any submission to point at
     submission = models.ForeignKey(
         "submissions.Submission",
         on_delete=models.CASCADE,
-        related_name="penalty_submission"
+        related_name="penalty_submission",
+        null=True,
+        blank=True,
     )
 
-    penalty_type = models.CharField(max_length=20, choices=PENALTY_TYPES)
+    penalty_type = models.CharField(max_length=20, choices=PENALTY_TYPES, default="money")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    reason = models.CharField(max_length=255, default="Missed goal")
     notes = models.TextField(blank=True)
 
     created_at = models.DateTimeField(default=timezone.now)
@@ -76,9 +67,10 @@ class Penalty(TimeStampedUUIDModel):
         ],
         default="pending",
     )
+    applied_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.penalty_type} penalty for {self.user}"
+        return f"{self.penalty_type} penalty of {self.amount} for {self.goal_log}"
 
 
 class MoneyPenalty(models.Model):
@@ -25,6 +25,8 @@ class HumanVerifierSerializer(serializers.ModelSerializer):
     
 
 class PenaltySerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source="penalty_type", read_only=True)
+
     class Meta:
         model = Penalty
         fields = ["id", "type", "amount", "reason", "applied_at"]
\ No newline at end of file
@@ -17,13 +17,13 @@ class Wallet(TimeStampedUUIDModel):
 
     def credit(self, amount: Decimal):
         self.balance += amount
-        self.save(update_fields=["balance"])
+        self.save(update_fields=["balance", "updated_at"])
 
     def debit(self, amount: Decimal):
         if self.balance < amount:
             raise ValueError("Insufficient funds")
         self.balance -= amount
-        self.save(update_fields=["balance"])
+        self.save(update_fields=["balance", "updated_at"])
 
 
 class WalletTransaction(TimeStampedUUIDModel):
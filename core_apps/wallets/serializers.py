@@ -1,13 +1,14 @@
 from rest_framework import serializers
+from core_apps.common.serializers import SparseFieldsetMixin
 from .models import Wallet, WalletTransaction, PayoutRequest
 
 
-class WalletSerializer(serializers.ModelSerializer):
+class WalletSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Wallet
         fields = ["id", "balance", "staked_balance"]
 
-class WalletTransactionSerializer(serializers.ModelSerializer):
+class WalletTransactionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = WalletTransaction
         fields = ["id", "reference", "amount", "type", "status", "created_at"]
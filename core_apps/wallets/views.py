@@ -5,7 +5,7 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.generics import GenericAPIView, RetrieveAPIView, CreateAPIView
 from .models import Wallet, WalletTransaction, PayoutRequest
 from .serializers import WalletSerializer, PayoutRequestSerializer, FundWalletSerializer
-from core_apps.common.mixins import StandardResponseMixin
+from core_apps.common.mixins import CachedResponseMixin, StandardResponseMixin
 from decimal import Decimal
 import uuid
 
@@ -14,7 +14,7 @@ PAYSTACK_SECRET_KEY = settings.PAYSTACK_SECRET_KEY
 PAYSTACK_BASE_URL = settings.PAYSTACK_BASE_URL
 
 
-class WalletView(StandardResponseMixin, RetrieveAPIView):
+class WalletView(StandardResponseMixin, CachedResponseMixin, RetrieveAPIView):
     """Get user wallet balance"""
     serializer_class = WalletSerializer
 
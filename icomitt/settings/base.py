@@ -45,6 +45,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 
@@ -127,6 +128,12 @@ DATABASES = {
 
 DATABASES["default"]["ATOMIC_REQUESTS"] = True
 
+# Point CACHE_URL at a cache every worker shares (e.g. redis://host:6379/0).
+# The dashboard and per-user response caches stay off with the local-memory default.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://")
+}
+
 
 PASSWORD_HASHERS = [
     "django.contrib.auth.hashers.Argon2PasswordHasher",
@@ -264,6 +271,33 @@ LOGGING = {
 }
 
 
+# Goal scheduling
+GOAL_OCCURRENCE_HORIZON_DAYS = env.int("GOAL_OCCURRENCE_HORIZON_DAYS", default=30)
+GOAL_SCHEDULE_CACHE_SIZE = env.int("GOAL_SCHEDULE_CACHE_SIZE", default=10000)
+GOAL_LOG_PRECREATE_DAYS = env.int("GOAL_LOG_PRECREATE_DAYS", default=7)
+GOAL_LOG_ARCHIVE_AFTER_DAYS = env.int("GOAL_LOG_ARCHIVE_AFTER_DAYS", default=365)
+
+# Delta sync
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int("SYNC_TOMBSTONE_RETENTION_DAYS", default=30)
+SYNC_INITIAL_LOG_DAYS = env.int("SYNC_INITIAL_LOG_DAYS", default=90)
+# Each token starts this far before the snapshot, so rows committed by slow
+# transactions while a sync was running are picked up by the next one
+SYNC_TOKEN_OVERLAP_SECONDS = env.int("SYNC_TOKEN_OVERLAP_SECONDS", default=5)
+
+# Dashboard; needs a shared CACHES backend, 0 turns the cache off
+DASHBOARD_CACHE_TTL = env.int("DASHBOARD_CACHE_TTL", default=30)
+
+# Batch endpoint
+BATCH_MAX_REQUESTS = env.int("BATCH_MAX_REQUESTS", default=20)
+
+# Per-user response cache; entries also die when the user's data version moves
+# on. Needs a shared CACHES backend; 0 turns it off
+RESPONSE_CACHE_TTL = env.int("RESPONSE_CACHE_TTL", default=300)
+
+# Full-text search
+SEARCH_CONFIG = env.str("SEARCH_CONFIG", default="english")  # Postgres text search configuration
+
+
 PAYSTACK_BASE_URL = env("PAYSTACK_BASE_URL")
 PAYSTACK_SECRET_KEY = env("PAYSTACK_SECRET_KEY")
 
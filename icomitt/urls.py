@@ -33,6 +33,7 @@ urlpatterns = [
     # path('api/v1/verifications/', include('core_apps.verifications.urls')),
     path('api/v1/submissions/', include('core_apps.submissions.urls')),
     path('api/v1/logs/', include('core_apps.logs.urls')),
+    path('api/v1/', include('core_apps.common.urls')),
 
 ]
 